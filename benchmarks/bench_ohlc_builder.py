@@ -0,0 +1,63 @@
+# benchmarks/bench_ohlc_builder.py
+"""
+Micro-benchmark: _to_df_from_json_list original vs core.ohlc_builder.build_ohlc_frame.
+
+Uso (desde la raíz del repo):
+    python -m benchmarks.bench_ohlc_builder
+"""
+import timeit
+from datetime import date, timedelta
+
+import pandas as pd
+
+from core.ohlc_builder import build_ohlc_frame
+
+SIZES = [100, 1_000, 10_000, 100_000]
+REPEAT = 5
+
+
+def legacy_to_df_from_json_list(json_list):
+    """Copia de la versión anterior de core.data_fetch._to_df_from_json_list."""
+    try:
+        df = pd.DataFrame(json_list)
+        for col in ["date", "open", "high", "low", "close", "volume"]:
+            if col not in df.columns:
+                df[col] = pd.NA
+        df["date"] = pd.to_datetime(df["date"])
+        df.sort_values("date", inplace=True)
+        df.reset_index(drop=True, inplace=True)
+        return df
+    except Exception:
+        return pd.DataFrame()
+
+
+def make_rows(n):
+    start = date(1990, 1, 1)
+    return [
+        {
+            "date": (start + timedelta(days=i)).isoformat(),
+            "open": 100 + i * 0.01, "high": 101 + i * 0.01,
+            "low": 99 + i * 0.01, "close": 100.5 + i * 0.01,
+            "adjusted_close": 100.5 + i * 0.01, "volume": 1_000_000 + i,
+        }
+        for i in range(n)
+    ]
+
+
+def best_of(fn, rows):
+    number = max(1, 20_000 // len(rows))
+    return min(timeit.repeat(lambda: fn(rows), number=number, repeat=REPEAT)) / number
+
+
+def main():
+    print(f"{'rows':>8} | {'legacy ms':>10} | {'builder ms':>10} | {'f32 ms':>8} | speedup")
+    for n in SIZES:
+        rows = make_rows(n)
+        t_old = best_of(legacy_to_df_from_json_list, rows)
+        t_new = best_of(build_ohlc_frame, rows)
+        t_f32 = best_of(lambda r: build_ohlc_frame(r, price_dtype="float32"), rows)
+        print(f"{n:>8} | {t_old * 1e3:>10.2f} | {t_new * 1e3:>10.2f} | {t_f32 * 1e3:>8.2f} | x{t_old / t_new:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+# benchmarks/run_benchmarks.py
+"""
+Suite de benchmarks offline para los hot paths de analytics e I/O.
+
+Cada caso se mide en varios tamaños de entrada. Los resultados se guardan en
+benchmarks/results/<timestamp>.json y se comparan contra la corrida anterior
+(o contra --baseline): lo que empeore más que --threshold se marca como regresión.
+
+Uso (desde la raíz del repo):
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --only utils --threshold 0.15
+    python -m benchmarks.run_benchmarks --quick --fail-on-regression
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import timeit
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic_data import generate_panel, panel_frame, close_matrix
+from benchmarks.bench_ohlc_builder import make_rows
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+DEFAULT_THRESHOLD = 0.20
+MIN_TIME = 0.2   # segundos mínimos por repetición
+REPEAT = 5
+
+
+# ======================================================
+# DATOS DE ENTRADA
+# ======================================================
+def _ohlc(n, ticker="SYN00000.US", seed=0):
+    years = max(1, int(np.ceil(n / 250)) + 1)
+    panel = generate_panel(1, years, seed=seed, crypto_share=0, ba_share=0,
+                           gap_prob=0, late_listing_share=0, split_prob=0)
+    return panel_frame(panel, panel["tickers"][0]).tail(n).reset_index(drop=True)
+
+
+def _close(n):
+    return _ohlc(n)["close"]
+
+
+def _paragraph(n_sentences):
+    rng = np.random.default_rng(n_sentences)
+    words = np.array("the company reported strong growth in cloud revenue while margins "
+                     "improved and analysts expect further gains next quarter".split())
+    return " ".join(
+        " ".join(rng.choice(words, size=12)).capitalize() + "."
+        for _ in range(n_sentences)
+    )
+
+
+# ======================================================
+# CASOS
+# cada factory(size) prepara los datos y devuelve (callable, teardown)
+# ======================================================
+def case_to_df_from_json_list(size):
+    from core.data_fetch import _to_df_from_json_list
+    rows = make_rows(size)
+    return lambda: _to_df_from_json_list(rows), None
+
+
+def case_sma(size):
+    from core.utils import sma
+    s = _close(size)
+    return lambda: sma(s, 20), None
+
+
+def case_ema(size):
+    from core.utils import ema
+    s = _close(size)
+    return lambda: ema(s, 20), None
+
+
+def case_rsi(size):
+    from core.utils import rsi
+    s = _close(size)
+    return lambda: rsi(s, 14), None
+
+
+def case_prepare_indicators(size):
+    from core.compare_pro import prepare_indicators
+    df = _ohlc(size)
+    return lambda: prepare_indicators(df), None
+
+
+def case_compute_volatility(size):
+    from core.compare_pro import compute_volatility
+    s = _close(size)
+    return lambda: compute_volatility(s), None
+
+
+def case_compute_sharpe(size):
+    from core.compare_pro import compute_sharpe
+    s = _close(size)
+    return lambda: compute_sharpe(s), None
+
+
+def case_indicator_panel(size):
+    from core.indicators import compute_panel
+    panel = generate_panel(size, 5, seed=size)
+    close = close_matrix(panel)
+    return lambda: compute_panel(close, ["SMA20", "SMA50", "EMA20", "RSI14", "BB20", "MACD"]), None
+
+
+def case_risk_metrics(size):
+    from core.risk_metrics import compute_risk, reference_max_drawdown
+    close = close_matrix(generate_panel(size, 5, seed=size))
+    result = compute_risk(close)
+    # antes de medir: el drawdown móvil tiene que coincidir con la referencia
+    c = np.asarray(close, dtype="float64")
+    for w in (20, 60):
+        for j in range(min(3, c.shape[1])):
+            ok = ~np.isnan(c[:, j])
+            expected = reference_max_drawdown(c[ok, j], w)
+            if not np.allclose(result[f"max_drawdown_{w}"][ok, j], expected, equal_nan=True):
+                raise AssertionError(f"max_drawdown_{w} no coincide con la referencia (columna {j})")
+    return lambda: compute_risk(close), None
+
+
+def case_decimate_chart(size):
+    from core.decimation import decimate_candles, decimate_line, point_budget
+    df = _ohlc(size)
+    line, candle = point_budget(kind="line"), point_budget(kind="candle")
+
+    def run():
+        decimate_line(df["date"], df["close"], line)
+        decimate_candles(df, candle)
+
+    return run, None
+
+
+def case_compare_tickers(size):
+    import core.compare as compare
+    records = {
+        "A": _ohlc(size, seed=1).to_dict(orient="records"),
+        "B": _ohlc(size, seed=2).to_dict(orient="records"),
+    }
+    original = compare.fetch_historical_data
+    # fuente de datos local: se mide el merge/cálculo, no la red
+    compare.fetch_historical_data = lambda ticker, period="3mo": records[ticker]
+
+    def teardown():
+        compare.fetch_historical_data = original
+
+    return lambda: compare.compare_tickers("A", "B"), teardown
+
+
+def case_summarize_text_local(size):
+    from core.overview import summarize_text_local
+    text = _paragraph(size)
+    return lambda: summarize_text_local(text, max_sentences=3), None
+
+
+def case_add_favorite(size):
+    import core.favorites as favorites
+    tmp = tempfile.mkdtemp(prefix="bench_fav_")
+    original = favorites.FAV_PATH
+    favorites.FAV_PATH = os.path.join(tmp, "favorites.json")
+    favorites._save_all({"bench": {"all": [f"T{i}.US" for i in range(size)], "categories": {}}})
+    counter = iter(range(10 ** 9))
+
+    def teardown():
+        favorites.FAV_PATH = original
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    return lambda: favorites.add_favorite("bench", f"NEW{next(counter)}.US"), teardown
+
+
+def case_suggest_etfs_by_keyword(size):
+    import core.etf_finder as etf_finder
+    tmp = tempfile.mkdtemp(prefix="bench_etf_")
+    original = etf_finder.CACHE_PATH
+    etf_finder.CACHE_PATH = os.path.join(tmp, "cache_etf_universe.json")
+    themes = [f"theme{i}" for i in range(max(1, size // 20))]
+    universe = {
+        th: [{"ticker": f"E{j}{i}", "name": f"ETF {th} {j}", "desc": f"Fondo {th}"} for j in range(20)]
+        for i, th in enumerate(themes)
+    }
+    etf_finder.save_cached_universe(universe)
+
+    def teardown():
+        etf_finder.CACHE_PATH = original
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    # keyword que no matchea temas: recorre nombre/desc de todo el universo
+    return lambda: etf_finder.suggest_etfs_by_keyword("fondo", max_results=8), teardown
+
+
+# nombre -> (grupo, factory, tamaños, tamaños --quick)
+CASES = {
+    "data_fetch._to_df_from_json_list": ("io", case_to_df_from_json_list, [100, 10_000, 100_000], [100, 10_000]),
+    "utils.sma": ("utils", case_sma, [1_000, 10_000, 100_000], [1_000, 10_000]),
+    "utils.ema": ("utils", case_ema, [1_000, 10_000, 100_000], [1_000, 10_000]),
+    "utils.rsi": ("utils", case_rsi, [1_000, 10_000, 100_000], [1_000, 10_000]),
+    "compare_pro.prepare_indicators": ("compare_pro", case_prepare_indicators, [250, 2_500, 25_000], [250, 2_500]),
+    "compare_pro.compute_volatility": ("compare_pro", case_compute_volatility, [250, 2_500, 25_000], [250, 2_500]),
+    "compare_pro.compute_sharpe": ("compare_pro", case_compute_sharpe, [250, 2_500, 25_000], [250, 2_500]),
+    "indicators.compute_panel": ("indicators", case_indicator_panel, [10, 100, 1_000], [10, 100]),
+    "risk_metrics.compute_risk": ("risk", case_risk_metrics, [10, 100, 1_000], [10, 100]),
+    "decimation.chart": ("charts", case_decimate_chart, [1_000, 10_000, 100_000], [1_000, 10_000]),
+    "compare.compare_tickers": ("compare", case_compare_tickers, [250, 2_500, 25_000], [250, 2_500]),
+    "overview.summarize_text_local": ("overview", case_summarize_text_local, [10, 100, 1_000], [10, 100]),
+    "favorites.add_favorite": ("io", case_add_favorite, [10, 1_000, 100_000], [10, 1_000]),
+    "etf_finder.suggest_etfs_by_keyword": ("io", case_suggest_etfs_by_keyword, [100, 1_000, 10_000], [100, 1_000]),
+}
+
+
+# ======================================================
+# MEDICIÓN
+# ======================================================
+def time_callable(fn):
+    """
+    Mejor tiempo por llamada (segundos): se calibra `number` para que cada
+    repetición dure al menos MIN_TIME y se toma el mínimo de REPEAT repeticiones.
+    """
+    timer = timeit.Timer(fn)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= MIN_TIME or number >= 1_000_000:
+            break
+        number = max(number * 2, int(number * MIN_TIME / max(elapsed, 1e-9)))
+    runs = timer.repeat(repeat=REPEAT, number=number)
+    return min(runs) / number
+
+
+def run_cases(only=None, quick=False):
+    results = {}
+    for name, (group, factory, sizes, quick_sizes) in CASES.items():
+        if only and only not in name and only != group:
+            continue
+        for size in (quick_sizes if quick else sizes):
+            key = f"{name}[{size}]"
+            try:
+                fn, teardown = factory(size)
+            except ImportError as e:
+                print(f"  {key:<48} SKIP ({e.name or e})")
+                continue
+            try:
+                seconds = time_callable(fn)
+            finally:
+                if teardown:
+                    teardown()
+            results[key] = seconds
+            print(f"  {key:<48} {seconds * 1e3:>12.4f} ms")
+    return results
+
+
+# ======================================================
+# RESULTADOS / COMPARACIÓN
+# ======================================================
+def save_results(results):
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(RESULTS_DIR, f"{stamp}.json")
+    payload = {
+        "timestamp": datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+    return path
+
+
+def latest_results(exclude=None):
+    files = sorted(glob.glob(os.path.join(RESULTS_DIR, "*.json")))
+    files = [f for f in files if f != exclude]
+    return files[-1] if files else None
+
+
+def compare_results(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Devuelve lista de (caso, antes, ahora, ratio, regresión?) para los casos en común.
+    """
+    rows = []
+    for key, now in current.items():
+        before = baseline.get(key)
+        if not before:
+            continue
+        ratio = now / before
+        rows.append((key, before, now, ratio, ratio > 1 + threshold))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks offline de AppFinanzAr")
+    parser.add_argument("--only", help="filtrar por grupo o parte del nombre del caso")
+    parser.add_argument("--quick", action="store_true", help="solo los tamaños chicos")
+    parser.add_argument("--baseline", help="JSON de resultados contra el cual comparar")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="empeoramiento relativo tolerado (0.2 = 20%%)")
+    parser.add_argument("--no-save", action="store_true", help="no guardar esta corrida")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    print("Benchmarks:")
+    results = run_cases(only=args.only, quick=args.quick)
+
+    path = None if args.no_save else save_results(results)
+    baseline_path = args.baseline or latest_results(exclude=path)
+    if path:
+        print(f"\nResultados guardados en {path}")
+
+    if not baseline_path:
+        print("Sin corrida anterior para comparar.")
+        return 0
+
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f).get("results", {})
+
+    rows = compare_results(results, baseline, args.threshold)
+    print(f"\nComparación contra {baseline_path} (umbral {args.threshold:.0%}):")
+    regressions = 0
+    for key, before, now, ratio, regressed in rows:
+        flag = "REGRESIÓN" if regressed else ("mejora" if ratio < 1 - args.threshold else "")
+        regressions += regressed
+        print(f"  {key:<48} {before * 1e3:>10.4f} -> {now * 1e3:>10.4f} ms  x{ratio:>5.2f}  {flag}")
+
+    if regressions:
+        print(f"\n{regressions} regresión(es) por encima del {args.threshold:.0%}")
+        if args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
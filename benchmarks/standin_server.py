@@ -0,0 +1,355 @@
+# benchmarks/standin_server.py
+"""
+Servidor HTTP local que imita EODHD y AlphaVantage a partir de fixtures grabados,
+con latencia, jitter, errores y throttling (429) configurables.
+Sirve para reproducir problemas de latencia y probar de punta a punta
+el pool HTTP, los reintentos, el rate limiter y el cache.
+
+Endpoints:
+    /api/eod/{TICKER}                   (from, to, limit, order)
+    /api/eod-bulk-last-day/{EXCHANGE}   (symbols, date)
+    /api/fundamentals/{TICKER}
+    /api/news                           (s / symbols, from, to, limit)
+    /api/screener                       (limit)
+    /query?function=OVERVIEW&symbol=X   (AlphaVantage)
+    /_stats                             (contadores del servidor)
+
+Uso (desde la raíz del repo):
+    python -m benchmarks.standin_server --port 8765 --latency-ms 150 --jitter-ms 50 \\
+        --error-rate 0.05 --rate-per-minute 60
+
+y en otra terminal:
+    EODHD_BASE_URL=http://127.0.0.1:8765/api \\
+    EODHD_PUBLIC_URL=http://127.0.0.1:8765/api \\
+    ALPHAVANTAGE_URL=http://127.0.0.1:8765/query \\
+    EODHD_API_KEY=test streamlit run app.py
+
+Si falta el fixture de eod/ de un ticker, se sintetiza una serie determinista.
+Con --record, los fixtures faltantes se descargan una vez de la API real y se guardan.
+"""
+import argparse
+import gzip
+import json
+import os
+import random
+import threading
+import time
+import urllib.parse
+import urllib.request
+import zlib
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+UPSTREAM_EODHD = "https://eodhd.com/api"
+UPSTREAM_ALPHAVANTAGE = "https://www.alphavantage.co/query"
+
+
+class StandinConfig:
+    def __init__(self, fixtures_dir=FIXTURES_DIR, latency_ms=0, jitter_ms=0, error_rate=0.0,
+                 rate_per_minute=0, seed=None, record=False, upstream_token=""):
+        self.fixtures_dir = fixtures_dir
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_per_minute = rate_per_minute   # 0 = sin límite
+        self.record = record
+        self.upstream_token = upstream_token
+        self.rng = random.Random(seed)
+
+
+class _Throttle:
+    """Token bucket del lado del servidor (para devolver 429 como EODHD)."""
+
+    def __init__(self, rate_per_minute):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(rate_per_minute)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self):
+        """Devuelve 0 si hay token, o los segundos a esperar (Retry-After)."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+            return (1 - self.tokens) / self.rate
+
+
+# ======================================================
+# FIXTURES
+# ======================================================
+def _fixture_path(cfg, *parts):
+    return os.path.join(cfg.fixtures_dir, *parts)
+
+
+def _load_fixture(cfg, *parts):
+    path = _fixture_path(cfg, *parts)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_fixture(cfg, data, *parts):
+    path = _fixture_path(cfg, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def _record(cfg, url, params, *parts):
+    """Descarga de la API real y guarda el fixture (modo --record)."""
+    if not cfg.record:
+        return None
+    query = urllib.parse.urlencode(params)
+    try:
+        with urllib.request.urlopen(f"{url}?{query}", timeout=30) as r:
+            data = json.loads(r.read().decode("utf-8"))
+    except Exception:
+        return None
+    _save_fixture(cfg, data, *parts)
+    return data
+
+
+def _synthetic_eod(ticker, days=3650):
+    """Serie diaria determinista para tickers sin fixture."""
+    rng = random.Random(zlib.crc32(ticker.encode("utf-8")))
+    crypto = ticker.endswith(".CC") or ticker.endswith(".CRYPTO")
+    price = rng.uniform(10, 500)
+    vol = 0.035 if crypto else 0.015
+    start = date.today() - timedelta(days=days)
+    rows = []
+    for i in range(days + 1):
+        d = start + timedelta(days=i)
+        if not crypto and d.weekday() >= 5:
+            continue
+        o = price
+        price = max(0.01, price * (1 + rng.gauss(0.0002, vol)))
+        hi = max(o, price) * (1 + abs(rng.gauss(0, vol / 2)))
+        lo = min(o, price) * (1 - abs(rng.gauss(0, vol / 2)))
+        rows.append({
+            "date": d.isoformat(), "open": round(o, 4), "high": round(hi, 4),
+            "low": round(lo, 4), "close": round(price, 4),
+            "adjusted_close": round(price, 4), "volume": rng.randint(100_000, 5_000_000),
+        })
+    return rows
+
+
+def _eod_rows(cfg, ticker, token):
+    rows = _load_fixture(cfg, "eod", f"{ticker}.json")
+    if rows is None:
+        rows = _record(cfg, f"{UPSTREAM_EODHD}/eod/{ticker}",
+                       {"api_token": token, "fmt": "json"}, "eod", f"{ticker}.json")
+    return rows if rows is not None else _synthetic_eod(ticker)
+
+
+# ======================================================
+# HANDLERS
+# ======================================================
+def handle_eod(cfg, ticker, q):
+    rows = _eod_rows(cfg, ticker, q.get("api_token", cfg.upstream_token))
+    if q.get("from"):
+        rows = [r for r in rows if r["date"] >= q["from"]]
+    if q.get("to"):
+        rows = [r for r in rows if r["date"] <= q["to"]]
+    if q.get("order") == "d":
+        rows = rows[::-1]
+    if q.get("limit"):
+        rows = rows[-int(q["limit"]):] if q.get("order") != "d" else rows[:int(q["limit"])]
+    return 200, rows
+
+
+def handle_bulk(cfg, exchange, q):
+    symbols = [s.strip().upper() for s in q.get("symbols", "").split(",") if s.strip()]
+    if not symbols:
+        eod_dir = _fixture_path(cfg, "eod")
+        files = os.listdir(eod_dir) if os.path.isdir(eod_dir) else []
+        symbols = [f[:-5].rsplit(".", 1)[0] for f in files if f.endswith(f".{exchange}.json")]
+    out = []
+    for code in symbols:
+        rows = _eod_rows(cfg, f"{code}.{exchange}", q.get("api_token", cfg.upstream_token))
+        if q.get("date"):
+            rows = [r for r in rows if r["date"] <= q["date"]]
+        if rows:
+            out.append(dict(rows[-1], code=code, exchange_short_name=exchange))
+    return 200, out
+
+
+def handle_fundamentals(cfg, ticker, q):
+    data = _load_fixture(cfg, "fundamentals", f"{ticker}.json")
+    if data is None:
+        data = _record(cfg, f"{UPSTREAM_EODHD}/fundamentals/{ticker}",
+                       {"api_token": q.get("api_token", cfg.upstream_token), "fmt": "json"},
+                       "fundamentals", f"{ticker}.json")
+    if data is None:
+        return 404, {"error": "Ticker Not Found."}
+    return 200, data
+
+
+def handle_news(cfg, q):
+    symbols = q.get("s") or q.get("symbols") or ""
+    items = []
+    for sym in [s.strip().upper() for s in symbols.split(",") if s.strip()]:
+        items.extend(_load_fixture(cfg, "news", f"{sym}.json") or [])
+    if q.get("from"):
+        items = [n for n in items if n.get("date", "")[:10] >= q["from"]]
+    if q.get("to"):
+        items = [n for n in items if n.get("date", "")[:10] <= q["to"]]
+    items.sort(key=lambda n: n.get("date", ""), reverse=True)
+    return 200, items[:int(q.get("limit", 50))]
+
+
+def handle_screener(cfg, q):
+    data = _load_fixture(cfg, "screener.json") or {"data": []}
+    return 200, {"data": data.get("data", [])[:int(q.get("limit", 50))]}
+
+
+def handle_alphavantage(cfg, q):
+    if q.get("function") != "OVERVIEW":
+        return 200, {"Information": "Solo OVERVIEW está disponible en el stand-in."}
+    symbol = (q.get("symbol") or "").upper().split(".")[0]
+    data = _load_fixture(cfg, "alphavantage", f"OVERVIEW_{symbol}.json")
+    if data is None:
+        data = _record(cfg, UPSTREAM_ALPHAVANTAGE,
+                       {"function": "OVERVIEW", "symbol": symbol, "apikey": q.get("apikey", "demo")},
+                       "alphavantage", f"OVERVIEW_{symbol}.json")
+    # AlphaVantage devuelve {} (200) para símbolos desconocidos
+    return 200, data or {}
+
+
+def route(cfg, path, q):
+    parts = [p for p in path.split("/") if p]
+    if parts[:1] == ["query"]:
+        return handle_alphavantage(cfg, q)
+    if parts[:1] != ["api"] or len(parts) < 2:
+        return 404, {"error": "not found"}
+    endpoint, rest = parts[1], parts[2:]
+    if endpoint in ("eod", "historical-prices") and rest:
+        return handle_eod(cfg, rest[0].upper(), q)
+    if endpoint == "eod-bulk-last-day" and rest:
+        return handle_bulk(cfg, rest[0].upper(), q)
+    if endpoint == "fundamentals" and rest:
+        return handle_fundamentals(cfg, rest[0].upper(), q)
+    if endpoint == "news":
+        return handle_news(cfg, q)
+    if endpoint in ("screener", "screening"):
+        return handle_screener(cfg, q)
+    return 404, {"error": "not found"}
+
+
+def make_handler(cfg):
+    throttle = _Throttle(cfg.rate_per_minute) if cfg.rate_per_minute else None
+    stats = {"requests": 0, "ok": 0, "errors": 0, "throttled": 0, "not_found": 0}
+    stats_lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"   # keep-alive, para ejercitar el pool del cliente
+
+        def log_message(self, fmt, *args):
+            pass
+
+        def _send(self, status, payload, headers=None):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            if "gzip" in self.headers.get("Accept-Encoding", "") and len(body) > 512:
+                body = gzip.compress(body)
+                self.send_header("Content-Encoding", "gzip")
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _count(self, key):
+            with stats_lock:
+                stats[key] += 1
+
+        def do_GET(self):
+            url = urllib.parse.urlsplit(self.path)
+            q = dict(urllib.parse.parse_qsl(url.query))
+            self._count("requests")
+
+            if url.path == "/_stats":
+                with stats_lock:
+                    return self._send(200, dict(stats))
+
+            delay = cfg.latency_ms + (cfg.rng.uniform(0, cfg.jitter_ms) if cfg.jitter_ms else 0)
+            if delay:
+                time.sleep(delay / 1000.0)
+
+            if throttle is not None:
+                wait = throttle.take()
+                if wait:
+                    self._count("throttled")
+                    return self._send(429, {"error": "Too Many Requests"},
+                                      {"Retry-After": str(max(1, int(wait + 0.999)))})
+
+            if cfg.error_rate and cfg.rng.random() < cfg.error_rate:
+                self._count("errors")
+                return self._send(cfg.rng.choice([500, 502, 503]), {"error": "Injected failure"})
+
+            status, payload = route(cfg, url.path, q)
+            self._count("ok" if status == 200 else "not_found")
+            self._send(status, payload)
+
+    return Handler
+
+
+def start_server(host="127.0.0.1", port=0, **kwargs):
+    """
+    Levanta el servidor en un thread (port=0 elige uno libre).
+    Devuelve (server, urls) con las URLs base para EODHD_BASE_URL / ALPHAVANTAGE_URL.
+    """
+    cfg = StandinConfig(**kwargs)
+    server = ThreadingHTTPServer((host, port), make_handler(cfg))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://{host}:{server.server_port}"
+    urls = {
+        "EODHD_BASE_URL": f"{base}/api",
+        "EODHD_PUBLIC_URL": f"{base}/api",
+        "ALPHAVANTAGE_URL": f"{base}/query",
+    }
+    return server, urls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in local de EODHD / AlphaVantage")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures", default=FIXTURES_DIR)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-per-minute", type=int, default=0, help="0 = sin throttling")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--record", action="store_true",
+                        help="descargar y guardar fixtures faltantes desde la API real")
+    args = parser.parse_args()
+
+    cfg = StandinConfig(
+        fixtures_dir=args.fixtures, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate, rate_per_minute=args.rate_per_minute, seed=args.seed,
+        record=args.record, upstream_token=os.getenv("EODHD_API_KEY", ""),
+    )
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(cfg))
+    server.daemon_threads = True
+    base = f"http://{args.host}:{server.server_port}"
+    print(f"Stand-in escuchando en {base}")
+    print(f"  EODHD_BASE_URL={base}/api  EODHD_PUBLIC_URL={base}/api  ALPHAVANTAGE_URL={base}/query")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+# benchmarks/synthetic_data.py
+"""
+Generador sintético de mercado para pruebas de escala (N tickers x M años), sin red.
+
+- Paneles OHLCV con retornos correlacionados (modelo de factores + GBM).
+- Calendarios: acciones en días hábiles (con feriados), cripto 24/7.
+- Huecos (barras faltantes), listados tardíos y splits sin ajustar.
+- Salida en el mismo formato que core.data_fetch.fetch_ohlc
+  (DataFrame date/open/high/low/close/volume) o directo al store local de OHLC.
+
+Uso (desde la raíz del repo):
+    python -m benchmarks.synthetic_data --tickers 2000 --years 20 --out data/synthetic_store
+"""
+import argparse
+import os
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+OHLC_COLUMNS = ["date", "open", "high", "low", "close", "volume"]
+
+# Cantidad aproximada de feriados por año en un calendario bursátil
+HOLIDAYS_PER_YEAR = 9
+SPLIT_RATIOS = np.array([2.0, 3.0, 4.0, 0.5])
+
+
+def _tickers(n_tickers, crypto_share, ba_share):
+    n_crypto = int(round(n_tickers * crypto_share))
+    n_ba = int(round(n_tickers * ba_share))
+    n_us = max(0, n_tickers - n_crypto - n_ba)
+    tickers = (
+        [f"SYN{i:05d}.US" for i in range(n_us)] +
+        [f"SYN{i:05d}.BA" for i in range(n_ba)] +
+        [f"SYN{i:05d}.CRYPTO" for i in range(n_crypto)]
+    )
+    is_crypto = np.array([t.endswith(".CRYPTO") for t in tickers])
+    return tickers, is_crypto
+
+
+def _trading_mask(dates, tickers, is_crypto, rng):
+    """
+    Máscara (T x N) de días con cotización: cripto todos los días,
+    el resto días hábiles menos feriados sorteados por exchange
+    (todos los tickers de un mismo exchange comparten calendario).
+    """
+    weekday = dates.weekday.to_numpy() < 5
+    n_years = max(1, len(dates) // 365)
+    business_idx = np.flatnonzero(weekday)
+    n_holidays = min(len(business_idx), HOLIDAYS_PER_YEAR * n_years)
+
+    exchanges = np.array([t.rpartition(".")[2] for t in tickers])
+    mask = np.empty((len(dates), len(tickers)), dtype=bool)
+    mask[:, is_crypto] = True
+    # orden fijo (US primero) para que la semilla dé siempre los mismos calendarios
+    for exchange in sorted(set(exchanges[~is_crypto]), key=lambda e: (e != "US", e)):
+        holidays = rng.choice(business_idx, size=n_holidays, replace=False)
+        stock_days = weekday.copy()
+        stock_days[holidays] = False
+        mask[:, (exchanges == exchange) & ~is_crypto] = stock_days[:, None]
+    return mask
+
+
+def generate_panel(n_tickers=100, years=10, end=None, seed=42, n_factors=3,
+                   crypto_share=0.1, ba_share=0.1, gap_prob=0.002,
+                   late_listing_share=0.2, split_prob=0.0002, dtype="float64"):
+    """
+    Genera un panel sintético sobre un calendario diario (unión de todos los exchanges).
+    Devuelve dict con:
+    - dates: DatetimeIndex (T)
+    - tickers: lista (N)
+    - open/high/low/close: arrays (T x N), NaN donde el ticker no cotiza
+    - volume: array int64 (T x N), 0 donde no cotiza
+    - splits: lista de (ticker, fecha, ratio)
+    """
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp(end or date.today()).normalize()
+    dates = pd.date_range(end - pd.DateOffset(years=years), end, freq="D")
+    T = len(dates)
+
+    tickers, is_crypto = _tickers(n_tickers, crypto_share, ba_share)
+    N = len(tickers)
+
+    # --- retornos correlacionados: r = F @ B' + e ---
+    factor_vol = 0.008
+    loadings = rng.normal(0.0, 1.0, (N, n_factors)).astype(dtype)
+    loadings[:, 0] = np.abs(loadings[:, 0]) + 0.5          # factor "mercado"
+    idio_vol = np.where(is_crypto, rng.uniform(0.03, 0.06, N), rng.uniform(0.008, 0.02, N)).astype(dtype)
+    drift = rng.normal(0.0002, 0.0002, N).astype(dtype)
+
+    factors = rng.normal(0.0, factor_vol, (T, n_factors)).astype(dtype)
+    log_ret = factors @ loadings.T
+    log_ret += rng.standard_normal((T, N), dtype=dtype) * idio_vol
+    log_ret += drift - 0.5 * idio_vol ** 2
+
+    start_price = np.exp(rng.uniform(np.log(5), np.log(500), N)).astype(dtype)
+    np.cumsum(log_ret, axis=0, out=log_ret)
+    close = start_price * np.exp(log_ret, out=log_ret)
+
+    # --- OHLC alrededor del close ---
+    prev = np.empty_like(close)
+    prev[0] = start_price
+    prev[1:] = close[:-1]
+    open_ = prev * (1 + rng.standard_normal((T, N), dtype=dtype) * (idio_vol / 3))
+    spread = np.abs(rng.standard_normal((T, N), dtype=dtype)) * (idio_vol / 2)
+    high = np.maximum(open_, close) * (1 + spread)
+    spread = np.abs(rng.standard_normal((T, N), dtype=dtype)) * (idio_vol / 2)
+    low = np.minimum(open_, close) * (1 - spread)
+    volume = rng.lognormal(13, 0.6, (T, N)).astype("int64")
+
+    # --- splits (precios sin ajustar: salto hacia atrás) ---
+    splits = []
+    n_splits = rng.binomial(T * N, split_prob) if split_prob else 0
+    for _ in range(n_splits):
+        j = int(rng.integers(N))
+        t = int(rng.integers(1, T))
+        ratio = float(rng.choice(SPLIT_RATIOS))
+        for arr in (open_, high, low, close):
+            arr[:t, j] *= ratio
+        volume[:t, j] = (volume[:t, j] / ratio).astype("int64")
+        splits.append((tickers[j], dates[t].date().isoformat(), ratio))
+
+    # --- calendario, listados tardíos y huecos ---
+    mask = _trading_mask(dates, tickers, is_crypto, rng)
+    late = rng.random(N) < late_listing_share
+    listing = np.where(late, rng.integers(0, max(1, T // 2), N), 0)
+    mask &= np.arange(T)[:, None] >= listing[None, :]
+    if gap_prob:
+        mask &= rng.random((T, N)) >= gap_prob
+
+    for arr in (open_, high, low, close):
+        arr[~mask] = np.nan
+    volume[~mask] = 0
+
+    return {
+        "dates": dates,
+        "tickers": tickers,
+        "open": open_,
+        "high": high,
+        "low": low,
+        "close": close,
+        "volume": volume,
+        "splits": splits,
+    }
+
+
+def panel_frame(panel, ticker):
+    """
+    DataFrame de un ticker con el formato de fetch_ohlc (solo días con cotización).
+    """
+    j = panel["tickers"].index(ticker)
+    valid = ~np.isnan(panel["close"][:, j])
+    return pd.DataFrame({
+        "date": panel["dates"][valid],
+        "open": panel["open"][valid, j],
+        "high": panel["high"][valid, j],
+        "low": panel["low"][valid, j],
+        "close": panel["close"][valid, j],
+        "volume": panel["volume"][valid, j],
+    })
+
+
+def iter_frames(panel):
+    """
+    Itera (ticker, DataFrame) para todo el panel.
+    """
+    for t in panel["tickers"]:
+        yield t, panel_frame(panel, t)
+
+
+def close_matrix(panel):
+    """
+    Matriz fecha x ticker de cierres (NaN donde no cotiza).
+    """
+    return pd.DataFrame(panel["close"], index=panel["dates"], columns=panel["tickers"])
+
+
+def write_to_store(panel, store_dir):
+    """
+    Escribe cada ticker en el store local de OHLC (core/ohlc_store.py) bajo store_dir,
+    de modo que load_ohlc/fetch_ohlc lo sirvan sin red.
+    """
+    from core import ohlc_store
+
+    previous = ohlc_store.STORE_DIR
+    ohlc_store.STORE_DIR = store_dir
+    try:
+        for t, df in iter_frames(panel):
+            ohlc_store.merge_ohlc(t, df, full_history=True)
+    finally:
+        ohlc_store.STORE_DIR = previous
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generador de mercado sintético")
+    parser.add_argument("--tickers", type=int, default=500)
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--crypto-share", type=float, default=0.1)
+    parser.add_argument("--out", default=os.path.join("data", "synthetic_store"))
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    panel = generate_panel(args.tickers, args.years, seed=args.seed, crypto_share=args.crypto_share)
+    t1 = time.perf_counter()
+    write_to_store(panel, args.out)
+    t2 = time.perf_counter()
+
+    bars = int((~np.isnan(panel["close"])).sum())
+    print(f"{len(panel['tickers'])} tickers x {len(panel['dates'])} días -> {bars:,} barras")
+    print(f"Splits: {len(panel['splits'])} | generación {t1 - t0:.2f}s | escritura {t2 - t1:.2f}s -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+# core/alignment.py
+import warnings
+
+import numpy as np
+import pandas as pd
+
+"""
+Alineación de N series por fecha en una matriz fecha x ticker, en un solo paso.
+- El calendario maestro sale de unir/intersecar los arrays de fechas ya ordenados
+  (np.unique / conteos) y cada ticker se ubica con searchsorted: nada de merges
+  encadenados, así escala a decenas de tickers.
+- Políticas:
+    "inner"    -> solo fechas en las que cotizan todos (lo que hacía pd.merge).
+    "union"    -> todas las fechas de todos; los huecos se completan con el último
+                  precio conocido (forward-fill), nunca hacia atrás.
+    "calendar" -> fechas del calendario de un exchange (p. ej. "US"); el resto de los
+                  tickers toma su último precio a esa fecha (cripto, feriados de .BA).
+"""
+
+POLICIES = ("inner", "union", "calendar")
+CRYPTO_SUFFIXES = ("CRYPTO", "CC")
+
+
+def exchange_of(ticker):
+    """
+    "MSFT.US" -> "US", "BTC.CRYPTO" -> "CRYPTO". Sin sufijo se asume US.
+    """
+    code, _, suffix = str(ticker).upper().rpartition(".")
+    return suffix if code else "US"
+
+
+def is_crypto(ticker):
+    return exchange_of(ticker) in CRYPTO_SUFFIXES
+
+
+def _series_arrays(data, column):
+    """
+    (fechas datetime64[D] ordenadas y sin duplicados, valores float64) desde un
+    DataFrame OHLC, una lista de dicts o una Series indexada por fecha.
+    """
+    if data is None:
+        return np.empty(0, "datetime64[D]"), np.empty(0)
+    if isinstance(data, pd.Series):
+        dates, values = data.index, data.to_numpy()
+    else:
+        df = data if isinstance(data, pd.DataFrame) else pd.DataFrame(list(data))
+        if df.empty or "date" not in df.columns or column not in df.columns:
+            return np.empty(0, "datetime64[D]"), np.empty(0)
+        dates, values = df["date"], df[column]
+
+    dates = _to_days(dates)
+    values = pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype="float64")
+    ok = ~np.isnat(dates) & ~np.isnan(values)
+    dates, values = dates[ok], values[ok]
+
+    if len(dates) > 1 and (np.diff(dates.view("i8")) <= 0).any():
+        order = np.argsort(dates, kind="stable")
+        dates, values = dates[order], values[order]
+        # fechas repetidas: queda la última
+        keep = np.ones(len(dates), dtype=bool)
+        keep[:-1] = dates[1:] != dates[:-1]
+        dates, values = dates[keep], values[keep]
+    return dates, values
+
+
+def _to_days(dates):
+    arr = np.asarray(dates)
+    if arr.dtype.kind == "M":
+        return arr.astype("datetime64[D]")
+    # camino rápido: strings "YYYY-MM-DD" / Timestamps (con zona horaria va por pandas)
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            return np.array(arr, dtype="datetime64[D]")
+    except (TypeError, ValueError, UserWarning, DeprecationWarning):
+        parsed = pd.to_datetime(pd.Series(arr), errors="coerce", utc=True).dt.tz_localize(None)
+        return parsed.to_numpy().astype("datetime64[D]")
+
+
+def _master_calendar(arrays, policy, calendar):
+    if policy == "inner":
+        if not arrays or any(len(d) == 0 for d, _ in arrays.values()):
+            return np.empty(0, "datetime64[D]")
+        all_dates, counts = np.unique(np.concatenate([d for d, _ in arrays.values()]), return_counts=True)
+        return all_dates[counts == len(arrays)]
+    if policy == "union":
+        parts = [d for d, _ in arrays.values()]
+        return np.unique(np.concatenate(parts)) if parts else np.empty(0, "datetime64[D]")
+
+    # "calendar": fechas del exchange de referencia
+    parts = [d for t, (d, _) in arrays.items() if exchange_of(t) == calendar]
+    if not parts:
+        parts = [d for d, _ in arrays.values()]
+    return np.unique(np.concatenate(parts)) if parts else np.empty(0, "datetime64[D]")
+
+
+def default_calendar(tickers):
+    """
+    Exchange de referencia: el del primer ticker no cripto (o CRYPTO si son todos cripto).
+    """
+    for t in tickers:
+        if not is_crypto(t):
+            return exchange_of(t)
+    return exchange_of(tickers[0]) if tickers else "US"
+
+
+def align_series(data, policy="union", column="close", calendar=None, max_gap_days=None):
+    """
+    Alinea N series en un DataFrame fecha x ticker.
+
+    data: dict ticker -> DataFrame OHLC (date + column), lista de dicts o Series por fecha.
+    policy: "inner", "union" o "calendar" (ver arriba).
+    calendar: exchange de referencia para "calendar" (por defecto default_calendar).
+    max_gap_days: en "union"/"calendar", no se arrastra un precio más viejo que esto.
+
+    Antes de la primera barra de un ticker queda NaN (no se inventa historia).
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Política de alineación desconocida: {policy!r}")
+
+    tickers = list(data)
+    arrays = {t: _series_arrays(data[t], column) for t in tickers}
+    if policy == "calendar":
+        calendar = (calendar or default_calendar(tickers)).upper()
+    master = _master_calendar(arrays, policy, calendar)
+
+    out = np.full((len(master), len(tickers)), np.nan)
+    for j, t in enumerate(tickers):
+        dates, values = arrays[t]
+        if not len(dates) or not len(master):
+            continue
+        # última barra en o antes de cada fecha del calendario (as-of)
+        idx = np.searchsorted(dates, master, side="right") - 1
+        ok = idx >= 0
+        if policy == "inner":
+            ok &= dates[np.maximum(idx, 0)] == master
+        elif max_gap_days is not None:
+            age = (master - dates[np.maximum(idx, 0)]).astype("int64")
+            ok &= age <= max_gap_days
+        out[ok, j] = values[idx[ok]]
+
+    index = pd.DatetimeIndex(master.astype("datetime64[ns]"), name="date")
+    return pd.DataFrame(out, index=index, columns=tickers)
+
+
+def rebase_pct(aligned):
+    """
+    Variación porcentual de cada columna desde su primer valor disponible.
+    """
+    if aligned.empty:
+        return aligned.copy()
+    first = aligned.bfill().iloc[0]
+    return (aligned / first - 1) * 100
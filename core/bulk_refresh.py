@@ -0,0 +1,137 @@
+# core/bulk_refresh.py
+import sys
+from datetime import date
+
+from core.eodhd_api import eod_request
+from core.ohlc_store import append_ohlc, last_date
+from core.indicator_state import update_indicators
+from core.ohlc_pyramid import update_store_pyramid
+from core.favorites import load_all_favorites
+
+"""
+Refresco masivo de cierres diarios usando el endpoint bulk de EODHD
+(eod-bulk-last-day/{EXCHANGE}): una sola llamada por exchange en lugar de una por ticker.
+Las filas se reparten en el store local de OHLC (core/ohlc_store.py) y los
+indicadores y agregados semanales/mensuales guardados se actualizan de forma
+incremental (core/indicator_state.py, core/ohlc_pyramid.py).
+
+Uso nocturno:
+    python -m core.bulk_refresh            # todos los favoritos de todos los usuarios
+    python -m core.bulk_refresh MSFT.US GGAL.BA BTC.CRYPTO
+"""
+
+# Sufijo de ticker en la app -> código de exchange en EODHD
+EXCHANGE_MAP = {
+    "US": "US",
+    "BA": "BA",
+    "CRYPTO": "CC",
+    "CC": "CC",
+}
+
+# Si el store quedó más atrás que esto, no se agrega la barra bulk
+# (se dejaría un hueco); sync_ohlc completa la cola normalmente.
+BULK_MAX_GAP_DAYS = 5
+
+
+def split_ticker(ticker):
+    """
+    "MSFT.US" -> ("MSFT", "US"), "BTC.CRYPTO" -> ("BTC-USD", "CC").
+    Tickers sin sufijo se asumen US.
+    """
+    t = ticker.upper()
+    code, _, suffix = t.rpartition(".")
+    if not code:
+        code, suffix = t, "US"
+    exchange = EXCHANGE_MAP.get(suffix)
+    if exchange == "CC" and "-" not in code:
+        code = f"{code}-USD"
+    return code, exchange
+
+
+def fetch_bulk_last_day(exchange, symbols=None, day=None):
+    """
+    Descarga el último día (o `day`) de todo un exchange.
+    Con `symbols` EODHD filtra del lado del servidor (respuesta más chica).
+    Devuelve lista de dicts o [] si falla.
+    """
+    params = {}
+    if symbols:
+        params["symbols"] = ",".join(sorted(symbols))
+    if day:
+        params["date"] = str(day)
+    # sin response_cache: con stale-while-revalidate la corrida nocturna recibiría
+    # el bulk de la noche anterior (y el refresco en segundo plano muere con el proceso)
+    res = eod_request(f"eod-bulk-last-day/{exchange}", params, cache=False)
+    return res if isinstance(res, list) else []
+
+
+def refresh_bulk(tickers, day=None):
+    """
+    Actualiza el store de OHLC de muchos tickers con una llamada por exchange.
+    Devuelve {"requests": n, "updated": [...], "skipped": {ticker: motivo}}.
+    """
+    by_exchange = {}
+    skipped = {}
+    for t in dict.fromkeys(tk.upper() for tk in tickers if tk):
+        code, exchange = split_ticker(t)
+        if exchange is None:
+            skipped[t] = "exchange no soportado"
+            continue
+        by_exchange.setdefault(exchange, {})[code] = t
+
+    updated = []
+    requests_made = 0
+    for exchange, codes in by_exchange.items():
+        rows = fetch_bulk_last_day(exchange, symbols=codes.keys(), day=day)
+        requests_made += 1
+        rows_by_code = {str(r.get("code", "")).upper(): r for r in rows}
+
+        for code, ticker in codes.items():
+            row = rows_by_code.get(code)
+            if row is None:
+                skipped[ticker] = "sin datos en bulk"
+                continue
+
+            last = last_date(ticker)
+            if last is None:
+                skipped[ticker] = "sin historial local"
+                continue
+            try:
+                row_day = date.fromisoformat(str(row.get("date"))[:10])
+            except ValueError:
+                skipped[ticker] = "fecha inválida"
+                continue
+            if (row_day - last).days > BULK_MAX_GAP_DAYS:
+                skipped[ticker] = "historial desactualizado"
+                continue
+
+            if append_ohlc(ticker, [row]):
+                update_indicators(ticker)
+                update_store_pyramid(ticker)
+                updated.append(ticker)
+            else:
+                skipped[ticker] = "ya actualizado"
+
+    return {"requests": requests_made, "updated": updated, "skipped": skipped}
+
+
+def favorites_universe():
+    """
+    Todos los tickers favoritos de todos los usuarios (sin duplicados).
+    """
+    tickers = []
+    for user in load_all_favorites().values():
+        items = user.get("all", []) if isinstance(user, dict) else user
+        for it in items or []:
+            t = it.get("ticker") if isinstance(it, dict) else it
+            if t and t not in tickers:
+                tickers.append(t)
+    return tickers
+
+
+if __name__ == "__main__":
+    universe = sys.argv[1:] or favorites_universe()
+    summary = refresh_bulk(universe)
+    print(f"Requests: {summary['requests']} | Actualizados: {len(summary['updated'])}")
+    for t, reason in summary["skipped"].items():
+        print(f"  - {t}: {reason}")
@@ -1,5 +1,9 @@
+import hashlib
 import json
 import os
+import threading
+import time
+from collections import OrderedDict
 
 def cache_load(path, default=None):
     """
@@ -25,4 +29,156 @@ def cache_save(path, data):
             json.dump(data, f, indent=4)
     except Exception:
         pass
-# Placeholder: future caching
+
+
+# -----------------------------
+# CACHE EN DOS NIVELES (memoria LRU + disco)
+# -----------------------------
+class TieredCache:
+    """
+    Cache memoria (LRU acotada) + disco (un JSON por clave), con TTL por familia
+    y stale-while-revalidate: si el valor venció pero no es demasiado viejo,
+    se devuelve igual y se refresca en segundo plano.
+    """
+
+    def __init__(self, base_dir, ttls, default_ttl=3600, max_items=256, max_stale=7 * 24 * 3600):
+        self.base_dir = base_dir
+        self.ttls = dict(ttls)
+        self.default_ttl = default_ttl
+        self.max_items = max_items
+        self.max_stale = max_stale
+        self._mem = OrderedDict()
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self.stats = {
+            "hits": 0, "disk_hits": 0, "stale_hits": 0, "misses": 0,
+            "evictions": 0, "refreshes": 0, "refresh_errors": 0,
+        }
+
+    # ---------- helpers ----------
+    def ttl_for(self, family):
+        return self.ttls.get(family, self.default_ttl)
+
+    def _path(self, key, family):
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.base_dir, family, f"{digest}.json")
+
+    def _mem_get(self, key):
+        with self._lock:
+            entry = self._mem.get(key)
+            if entry is not None:
+                self._mem.move_to_end(key)
+            return entry
+
+    def _mem_put(self, key, entry):
+        with self._lock:
+            self._mem[key] = entry
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.max_items:
+                self._mem.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def _disk_get(self, key, family):
+        entry = cache_load(self._path(key, family))
+        if not isinstance(entry, dict) or "ts" not in entry:
+            return None
+        return entry
+
+    def _disk_put(self, key, family, entry):
+        path = self._path(key, family)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp, path)
+        except Exception:
+            pass
+
+    def _count(self, stat):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _store(self, key, family, value):
+        entry = {"ts": time.time(), "value": value}
+        self._mem_put(key, entry)
+        self._disk_put(key, family, entry)
+
+    def _refresh_async(self, key, family, fetch_fn):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run():
+            outcome = "refresh_errors"
+            try:
+                value = fetch_fn()
+                if value is not None:
+                    self._store(key, family, value)
+                    outcome = "refreshes"
+            except Exception:
+                pass
+            finally:
+                # los contadores se tocan desde varios threads: siempre bajo el lock
+                with self._lock:
+                    self.stats[outcome] += 1
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    # ---------- API ----------
+    def get_or_fetch(self, key, family, fetch_fn):
+        """
+        Devuelve el valor cacheado para key o lo obtiene con fetch_fn().
+        Los None (errores) no se cachean.
+        """
+        ttl = self.ttl_for(family)
+        now = time.time()
+
+        entry = self._mem_get(key)
+        from_disk = False
+        if entry is None:
+            entry = self._disk_get(key, family)
+            from_disk = entry is not None
+            if from_disk:
+                self._mem_put(key, entry)
+
+        if entry is not None:
+            age = now - entry["ts"]
+            if age < ttl:
+                self._count("disk_hits" if from_disk else "hits")
+                return entry["value"]
+            if age < ttl + self.max_stale:
+                self._count("stale_hits")
+                self._refresh_async(key, family, fetch_fn)
+                return entry["value"]
+
+        self._count("misses")
+        value = fetch_fn()
+        if value is not None:
+            self._store(key, family, value)
+        elif entry is not None:
+            # la API falló: mejor un dato viejo que nada
+            return entry["value"]
+        return value
+
+    def invalidate(self, key, family):
+        with self._lock:
+            self._mem.pop(key, None)
+        try:
+            os.remove(self._path(key, family))
+        except OSError:
+            pass
+
+    def clear_memory(self):
+        with self._lock:
+            self._mem.clear()
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["memory_items"] = len(self._mem)
+        lookups = stats["hits"] + stats["disk_hits"] + stats["stale_hits"] + stats["misses"]
+        stats["hit_rate"] = round((lookups - stats["misses"]) / lookups, 3) if lookups else 0.0
+        return stats
@@ -1,35 +1,41 @@
 # core/compare.py
 
 import pandas as pd
-from core.data_fetch import fetch_historical_data
+from core.data_fetch import fetch_historical_data, fetch_many
+from core.alignment import align_series, rebase_pct
 
-def compare_tickers(ticker1, ticker2, period="3mo"):
+
+def compare_series(tickers, period="3mo", policy="union", calendar=None):
     """
-    Compara dos tickers obteniendo precios históricos y variación porcentual.
-    Utiliza el data_fetch existente para no duplicar lógica ni gastar requests.
+    Compara N tickers: precios alineados por fecha y variación porcentual desde el inicio.
+    policy: "union" (no se pierden fechas; huecos con el último precio), "inner"
+    (solo fechas comunes) o "calendar" (calendario de un exchange, ver core.alignment).
+    Devuelve DataFrame con date, close_{ticker}... y pct_{ticker}..., o None si algún
+    ticker no trajo datos.
     """
-
-    data1 = fetch_historical_data(ticker1, period)
-    data2 = fetch_historical_data(ticker2, period)
-
-    if data1 is None or data2 is None:
+    data, errors = fetch_many(fetch_historical_data, tickers, is_valid=bool, period=period)
+    if errors or not data:
         return None
 
-    df1 = pd.DataFrame(data1)
-    df2 = pd.DataFrame(data2)
+    aligned = align_series({t: data[t] for t in tickers if t in data}, policy=policy, calendar=calendar)
+    pct = rebase_pct(aligned)
 
-    # Normalizamos por fecha (inner join)
-    merged = pd.merge(df1[['date', 'close']], df2[['date', 'close']],
-                      on='date', suffixes=(f"_{ticker1}", f"_{ticker2}"))
+    out = pd.DataFrame({"date": aligned.index})
+    for t in aligned.columns:
+        out[f"close_{t}"] = aligned[t].to_numpy()
+    for t in aligned.columns:
+        out[f"pct_{t}"] = pct[t].to_numpy()
+    return out
 
-    # Variación porcentual desde el inicio
-    merged[f"pct_{ticker1}"] = (merged[f"close_{ticker1}"] /
-                                merged[f"close_{ticker1}"].iloc[0] - 1) * 100
 
-    merged[f"pct_{ticker2}"] = (merged[f"close_{ticker2}"] /
-                                merged[f"close_{ticker2}"].iloc[0] - 1) * 100
-
-    return merged
+def compare_tickers(ticker1, ticker2, period="3mo", policy="union"):
+    """
+    Compara dos tickers obteniendo precios históricos y variación porcentual.
+    Utiliza el data_fetch existente para no duplicar lógica ni gastar requests.
+    Las fechas se alinean con core.alignment (por defecto unión con forward-fill,
+    así no se pierden los fines de semana de cripto ni los días propios de .BA).
+    """
+    return compare_series([ticker1, ticker2], period, policy=policy)
 
 def get_competitors(ticker):
     """
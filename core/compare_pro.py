@@ -2,20 +2,33 @@
 
 import pandas as pd
 import numpy as np
-from core.data_fetch import fetch_ohlc, fetch_news
-from core.fundamentals import fetch_fundamentals
-from core.overview import compute_sentiment_overview
+from core.data_fetch import fetch_ohlc_many, fetch_news, fetch_many
+from core.fundamentals import fetch_fundamentals_many
+from core.overview import sentiment_overview_from_news
 from core.utils import rsi
+from core.indicator_cache import cached_indicator, is_cached, series_fingerprint
+from core.indicators import compute_panel
+from core.alignment import align_series, rebase_pct
+from core.risk_metrics import compute_risk
 
 # Sentiment Model
 try:
-    from core.sentiment_model import sentiment_score
+    from core.sentiment_model import sentiment_scores
     from core.translator import translate_to_english
     SENT_AVAILABLE = True
 except Exception:
     SENT_AVAILABLE = False
 
 
+# Indicadores de la comparación: (columna, indicador, params del cache)
+PRO_INDICATORS = [
+    ("SMA20", "SMA", {"window": 20}),
+    ("SMA50", "SMA", {"window": 50}),
+    ("EMA20", "EMA", {"span": 20}),
+    ("RSI14", "RSI", {"period": 14}),
+]
+
+
 # =======================================================
 #   UTILIDADES
 # =======================================================
@@ -33,79 +46,178 @@ def compute_sharpe(series, rf=0.0):
     return round((excess.mean() / returns.std()) * np.sqrt(252), 4)
 
 
-def prepare_indicators(df):
+def _single_indicator(col, close):
+    if col == "SMA20":
+        return close.rolling(20).mean()
+    if col == "SMA50":
+        return close.rolling(50).mean()
+    if col == "EMA20":
+        return close.ewm(span=20).mean()
+    return pd.to_numeric(rsi(close, 14), errors="coerce")
+
+
+def prepare_indicators(df, ticker=None):
     d = df.copy()
-    d["SMA20"] = d["close"].rolling(20).mean()
-    d["SMA50"] = d["close"].rolling(50).mean()
-    d["EMA20"] = d["close"].ewm(span=20).mean()
-    d["RSI14"] = rsi(d["close"], 14)
+    close = d["close"]
+    # mismo ticker + mismos cierres -> los indicadores salen del cache
+    fp = series_fingerprint(close, d["date"] if "date" in d.columns else None)
+    for col, name, params in PRO_INDICATORS:
+        d[col] = cached_indicator(ticker, close, name, params,
+                                  lambda c=col: _single_indicator(c, close), fingerprint=fp)
     return d
 
 
+def prepare_indicators_many(frames):
+    """
+    prepare_indicators para varios tickers: lo que no está en el cache de indicadores
+    se calcula en una sola pasada vectorizada (core.indicators) y se guarda en el
+    mismo cache, así prepare_indicators y compare_many comparten resultados.
+    """
+    fps = {
+        t: series_fingerprint(df["close"], df["date"] if "date" in df.columns else None)
+        for t, df in frames.items()
+    }
+    missing = [
+        t for t in frames
+        if not all(is_cached(t, fps[t], name, params) for _, name, params in PRO_INDICATORS)
+    ]
+
+    panel_values = {}
+    if missing:
+        # panel sin forward-fill: cada ticker conserva solo sus barras
+        panel = align_series({t: frames[t] for t in missing}, policy="union", max_gap_days=0)
+        res = compute_panel(panel, [col for col, _, _ in PRO_INDICATORS], ema_adjust=True)
+        for t in missing:
+            j = res["tickers"].index(t)
+            pos = panel.index.get_indexer(pd.to_datetime(frames[t]["date"]).dt.normalize())
+            panel_values[t] = {
+                col: np.where(pos >= 0, res[col][pos, j], np.nan) for col, _, _ in PRO_INDICATORS
+            }
+
+    out = {}
+    for t, df in frames.items():
+        d = df.copy()
+        close = d["close"]
+        for col, name, params in PRO_INDICATORS:
+            computed = panel_values.get(t, {}).get(col)
+            fn = (lambda v=computed: v) if computed is not None else (lambda c=col: _single_indicator(c, close))
+            d[col] = cached_indicator(t, close, name, params, fn, fingerprint=fps[t])
+        out[t] = d
+    return out
+
+
+def _avg_model_sentiment(items):
+    texts = []
+    for it in items:
+        t = it.get("title", "") + " " + it.get("content", "")
+        t_en = translate_to_english(t) if t else t
+        if t_en:
+            texts.append(t_en)
+    scores = sentiment_scores(texts)
+    return float(np.mean(scores)) if scores else None
+
+
 # =======================================================
 #   LÓGICA PRINCIPAL PRO
 # =======================================================
 
-def compare_pro(ticker_a, ticker_b, from_date=None, to_date=None):
-    # ------------------ OHLC ---------------------
-    df_a = fetch_ohlc(ticker_a, from_date=from_date, to_date=to_date)
-    df_b = fetch_ohlc(ticker_b, from_date=from_date, to_date=to_date)
+def compare_many(tickers, from_date=None, to_date=None, policy="calendar", with_sentiment=True):
+    """
+    Comparación de N activos: cada uno se descarga una sola vez (OHLC, fundamentales,
+    noticias) y las métricas/indicadores se calculan sobre todo el conjunto.
+
+    policy: alineación de fechas para el gráfico normalizado y la correlación
+    (ver core.alignment; "calendar" = calendario del primer ticker no cripto).
+
+    Devuelve dict con tickers, ohlc, aligned, normalized, metrics, correlation,
+    fundamentals, competitors, sentiment y errors ({ticker: motivo}); None si
+    ningún ticker trajo precios.
+    """
+    tickers = list(dict.fromkeys(t.upper() for t in tickers if t))
 
-    if df_a.empty or df_b.empty:
+    # ------------------ OHLC ---------------------
+    ohlc, errors = fetch_ohlc_many(tickers, from_date=from_date, to_date=to_date)
+    ok = [t for t in tickers if t in ohlc]
+    if not ok:
         return None
 
-    A = prepare_indicators(df_a)
-    B = prepare_indicators(df_b)
+    frames = prepare_indicators_many({t: ohlc[t] for t in ok})
 
+    # ------------------ MÉTRICAS ---------------------
+    raw = align_series(frames, policy="union", max_gap_days=0)
+    summary = compute_risk(raw, windows=())["summary"]
     metrics = {
-        ticker_a: {
-            "volatility": compute_volatility(A["close"]),
-            "sharpe": compute_sharpe(A["close"]),
-            "last_close": float(A["close"].iloc[-1])
-        },
-        ticker_b: {
-            "volatility": compute_volatility(B["close"]),
-            "sharpe": compute_sharpe(B["close"]),
-            "last_close": float(B["close"].iloc[-1])
-        },
+        t: {
+            "volatility": _round(summary.at[t, "volatility"]),
+            "sharpe": _round(summary.at[t, "sharpe"]),
+            "sortino": _round(summary.at[t, "sortino"]),
+            "max_drawdown": _round(summary.at[t, "max_drawdown"]),
+            "last_close": float(frames[t]["close"].iloc[-1]),
+        }
+        for t in ok
     }
 
+    aligned = align_series(frames, policy=policy)
+    correlation = aligned.pct_change(fill_method=None).corr()
+
     # ------------------ FUNDAMENTALES ---------------------
-    f_a, comp_a = fetch_fundamentals(ticker_a)
-    f_b, comp_b = fetch_fundamentals(ticker_b)
+    fund_map, _ = fetch_fundamentals_many(ok)
+    fundamentals = {t: fund_map.get(t, ({}, []))[0] for t in ok}
+    competitors = {t: fund_map.get(t, ({}, []))[1] for t in ok}
 
     # ------------------ SENTIMIENTO -----------------------
-    # 1) Overview (fallback)
-    sent_a = compute_sentiment_overview(ticker_a)
-    sent_b = compute_sentiment_overview(ticker_b)
-
-    # 2) Modelo transformer real
-    if SENT_AVAILABLE:
-        try:
-            headlines_a = fetch_news(ticker_a)[:10]
-            headlines_b = fetch_news(ticker_b)[:10]
-
-            def avg_sent(items):
-                scores = []
-                for it in items:
-                    t = it.get("title", "") + " " + it.get("content", "")
-                    t_en = translate_to_english(t) if t else t
-                    if t_en:
-                        scores.append(sentiment_score(t_en))
-                return float(np.mean(scores)) if scores else None
-
-            sent_a = {"avg_score": avg_sent(headlines_a)}
-            sent_b = {"avg_score": avg_sent(headlines_b)}
-
-        except:
-            pass
+    sentiment = {t: None for t in ok}
+    if with_sentiment:
+        news, _ = fetch_many(fetch_news, ok, is_valid=bool)
+        # 1) Overview (fallback)
+        sentiment = {t: sentiment_overview_from_news(news.get(t)) for t in ok}
+
+        # 2) Modelo transformer real
+        if SENT_AVAILABLE:
+            try:
+                sentiment = {t: {"avg_score": _avg_model_sentiment(news.get(t, [])[:10])} for t in ok}
+            except Exception:
+                pass
 
     return {
-        "ohlc": {ticker_a: A, ticker_b: B},
+        "tickers": ok,
+        "ohlc": frames,
+        "aligned": aligned,
+        "normalized": rebase_pct(aligned),
         "metrics": metrics,
-        "fundamentals": {ticker_a: f_a, ticker_b: f_b},
-        "competitors": {ticker_a: comp_a, ticker_b: comp_b},
-        "sentiment": {ticker_a: sent_a, ticker_b: sent_b}
+        "correlation": correlation,
+        "fundamentals": fundamentals,
+        "competitors": competitors,
+        "sentiment": sentiment,
+        "errors": errors,
+    }
+
+
+def _round(v, nd=4):
+    return None if v is None or pd.isna(v) else round(float(v), nd)
+
+
+def compare_pro(ticker_a, ticker_b, from_date=None, to_date=None):
+    """
+    Vista de dos activos sobre compare_many (misma estructura de siempre,
+    más df_a/df_b y la correlación entre ambos).
+    """
+    res = compare_many([ticker_a, ticker_b], from_date, to_date)
+    a, b = ticker_a.upper(), ticker_b.upper()
+    if not res or a not in res["ohlc"] or b not in res["ohlc"]:
+        return None
+
+    pick = lambda d: {ticker_a: d[a], ticker_b: d[b]}
+    corr = res["correlation"]
+    return {
+        "ohlc": pick(res["ohlc"]),
+        "df_a": res["ohlc"][a],
+        "df_b": res["ohlc"][b],
+        "metrics": pick(res["metrics"]),
+        "correlation": None if a == b else _round(corr.at[a, b]),
+        "fundamentals": pick(res["fundamentals"]),
+        "competitors": pick(res["competitors"]),
+        "sentiment": pick(res["sentiment"])
     }
 
 
@@ -23,3 +23,44 @@ if not API_KEY:
 
 # 📅 Parámetros generales
 NEWS_DAYS_BACK = 60
+
+# 🔀 Concurrencia para descargas multi-ticker
+FETCH_MAX_WORKERS = 8
+
+# ⏱️ Límites de la API EODHD (ajustar según el plan contratado)
+EODHD_RATE_PER_MINUTE = 1000
+EODHD_DAILY_QUOTA = 100000
+RATE_LIMIT_MAX_WAIT = 30  # segundos máximos en cola antes de desistir
+
+# 🗃️ Cache de respuestas EODHD (TTL en segundos por familia de endpoint)
+CACHE_DIR = "data/cache"
+CACHE_TTLS = {
+    "eod": 6 * 3600,
+    "fundamentals": 24 * 3600,
+    "news": 30 * 60,
+    "screener": 24 * 3600,
+}
+CACHE_DEFAULT_TTL = 3600
+CACHE_MEMORY_ITEMS = 256
+CACHE_MAX_STALE = 7 * 24 * 3600  # hasta cuándo se sirve un valor vencido mientras se refresca
+
+# 📈 Cache de indicadores calculados (presupuesto de memoria en bytes)
+INDICATOR_CACHE_BYTES = 64 * 1024 * 1024
+
+# 📊 Gráficos: figuras serializadas en memoria y umbral de puntos para pasar a WebGL
+FIGURE_CACHE_ITEMS = 64
+CHART_WEBGL_THRESHOLD = 2000
+
+# 🧠 Modelo de sentimiento: textos por lote e hilos de torch (0 = default de torch)
+SENTIMENT_BATCH_SIZE = 16
+SENTIMENT_THREADS = int(os.getenv("SENTIMENT_THREADS", "0"))
+
+# 💾 Cache de puntajes de sentimiento (SQLite + LRU en memoria)
+SENTIMENT_CACHE_PATH = os.path.join(CACHE_DIR, "sentiment_scores.sqlite")
+SENTIMENT_CACHE_MEMORY_ITEMS = 4096
+
+# 🌐 URLs base de las APIs (se pueden apuntar al servidor local de pruebas:
+#    python -m benchmarks.standin_server)
+EODHD_BASE_URL = os.getenv("EODHD_BASE_URL", "https://eodhd.com/api").rstrip("/")
+EODHD_PUBLIC_URL = os.getenv("EODHD_PUBLIC_URL", "https://eodhistoricaldata.com/api").rstrip("/")
+ALPHAVANTAGE_URL = os.getenv("ALPHAVANTAGE_URL", "https://www.alphavantage.co/query")
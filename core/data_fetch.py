@@ -1,14 +1,19 @@
 # core/data_fetch.py
 import os
-import requests
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, timedelta, datetime
-from .config import API_KEY, NEWS_DAYS_BACK
+from .config import API_KEY, NEWS_DAYS_BACK, FETCH_MAX_WORKERS, EODHD_PUBLIC_URL
+from .http_client import http_get
+from .ohlc_store import ensure_range, load_ohlc
+from .json_stream import decode_ohlc_stream, decode_news_stream
+from .ohlc_builder import build_ohlc_frame, OHLC_COLUMNS
+from .demo_data import is_demo_ticker, demo_ohlc, demo_news
 
 # Intentar usar eodhd_api si existe en el proyecto
 EOD_AVAILABLE = False
 try:
-    from core.eodhd_api import fetch_eodhd, eod_request  # funciones compatibles si existen
+    from core.eodhd_api import fetch_eodhd, eod_request, eod_request_stream  # funciones compatibles si existen
     EOD_AVAILABLE = True
 except Exception:
     try:
@@ -20,18 +25,7 @@ except Exception:
 # -----------------------------
 # FALLBACK DEMO DATA (para mostrar la app sin consumir la API)
 # -----------------------------
-DEMO_OHLC = {
-    "MSFT.US": [
-        {"date": (datetime.today() - pd.Timedelta(days=i)).strftime("%Y-%m-%d"),
-         "open": 300 + i*0.2, "high": 302 + i*0.2, "low": 299 + i*0.2, "close": 301 + i*0.2, "volume": 1000000}
-        for i in range(60, -1, -1)
-    ],
-    "GGAL.BA": [
-        {"date": (datetime.today() - pd.Timedelta(days=i)).strftime("%Y-%m-%d"),
-         "open": 90 + i*0.1, "high": 91 + i*0.1, "low": 89 + i*0.1, "close": 90.5 + i*0.1, "volume": 200000}
-        for i in range(60, -1, -1)
-    ]
-}
+# Las series OHLC y noticias DEMO se generan bajo demanda en core/demo_data.py
 
 DEMO_FUNDAMENTALS = {
     "MSFT.US": {
@@ -66,70 +60,99 @@ DEMO_FUNDAMENTALS = {
     }
 }
 
-DEMO_NEWS = {
-    "MSFT.US": [
-        {"title": "Microsoft reports strong quarterly earnings", "content": "Microsoft beat expectations.", "published_at": (datetime.today()-pd.Timedelta(days=1)).isoformat()},
-        {"title": "Azure growth accelerates", "content": "Cloud business continues to expand.", "published_at": (datetime.today()-pd.Timedelta(days=3)).isoformat()},
-    ],
-    "GGAL.BA": [
-        {"title": "Grupo Galicia posts solid retail results", "content": "Positive numbers in consumer loans.", "published_at": (datetime.today()-pd.Timedelta(days=2)).isoformat()}
-    ]
-}
-
 # -----------------------------
 # UTILIDADES
 # -----------------------------
 def _to_df_from_json_list(json_list):
-    try:
-        df = pd.DataFrame(json_list)
-        for col in ["date","open","high","low","close","volume"]:
-            if col not in df.columns:
-                df[col] = pd.NA
-        df["date"] = pd.to_datetime(df["date"])
-        df.sort_values("date", inplace=True)
-        df.reset_index(drop=True, inplace=True)
+    """
+    Lista de dicts OHLC -> DataFrame tipado (ver core/ohlc_builder.py).
+    Las filas malformadas se descartan de a una y quedan en el log.
+    """
+    return build_ohlc_frame(json_list)
+
+def _slice_df(df, from_date=None, to_date=None):
+    """
+    Recorta localmente un DataFrame OHLC (ya ordenado por fecha) al rango pedido.
+    """
+    if df is None or df.empty or (from_date is None and to_date is None):
         return df
-    except Exception:
-        return pd.DataFrame()
+    dates = df["date"]
+    lo = dates.searchsorted(pd.Timestamp(from_date)) if from_date is not None else 0
+    hi = dates.searchsorted(pd.Timestamp(to_date), side="right") if to_date is not None else len(df)
+    return df.iloc[lo:hi].reset_index(drop=True)
 
 # -----------------------------
 # OHLC HISTÓRICO
 # -----------------------------
+def _fetch_eod_range(ticker, from_date=None, to_date=None):
+    """
+    Descarga barras diarias de EODHD en el rango pedido (usado por el store incremental).
+    Decodifica en streaming directo a columnas tipadas cuando está disponible.
+    Devuelve DataFrame / lista de dicts, o None si la API falló.
+    """
+    params = {"period": "d"}
+    if from_date:
+        params["from"] = str(from_date)
+    if to_date:
+        params["to"] = str(to_date)
+    if "eod_request_stream" in globals():
+        return eod_request_stream(f"eod/{ticker}", params, decoder=decode_ohlc_stream)
+    res = eod_request(f"eod/{ticker}", params)
+    if res is None:
+        return None
+    return res if isinstance(res, list) else []
+
+
 def fetch_ohlc(ticker, from_date=None, to_date=None):
     """
     Devuelve DataFrame OHLC. Intenta EODHD; si falla, usa DEMO para que la app muestre algo.
+    Con API disponible, sirve desde el store local y solo descarga lo que falta del rango.
+    Todas las rutas piden el rango al servidor y además recortan localmente.
     """
     ticker_norm = ticker.upper()
+    range_params = {}
+    if from_date:
+        range_params["from"] = str(from_date)
+    if to_date:
+        range_params["to"] = str(to_date)
+
     # 1) Si EOD disponible y API_KEY, usarlo (best-effort)
     if EOD_AVAILABLE and API_KEY:
+        try:
+            ensure_range(ticker_norm, from_date, to_date, _fetch_eod_range)
+            df = load_ohlc(ticker_norm, from_date, to_date)
+            if not df.empty:
+                return df
+        except Exception:
+            pass
         try:
             # Si fetch_eodhd existe, usarlo (espera lista de dicts)
             if "fetch_eodhd" in globals():
-                data = fetch_eodhd(ticker_norm, interval="1d", limit=200)
+                data = fetch_eodhd(ticker_norm, interval="1d", limit=200,
+                                   from_date=from_date, to_date=to_date)
                 if data and isinstance(data, list):
-                    return _to_df_from_json_list(data)
+                    return _slice_df(_to_df_from_json_list(data), from_date, to_date)
             # fallback a eod_request endpoints (por si existe)
             if "eod_request" in globals():
-                res = eod_request(f"historical-prices/{ticker_norm}")
+                res = eod_request(f"historical-prices/{ticker_norm}", dict(range_params))
                 if res and isinstance(res, list):
-                    return _to_df_from_json_list(res)
+                    return _slice_df(_to_df_from_json_list(res), from_date, to_date)
         except Exception:
             pass
 
     # 2) DEMO fallback (no más consultas)
-    if ticker_norm in DEMO_OHLC:
-        return _to_df_from_json_list(DEMO_OHLC[ticker_norm])
+    if is_demo_ticker(ticker_norm):
+        return demo_ohlc(ticker_norm, from_date, to_date)[OHLC_COLUMNS]
 
     # 3) Intentar llamada pública de EODHD sin API (muy probable que falle), y si falla devolver vacío
     try:
-        url = f"https://eodhistoricaldata.com/api/eod/{ticker_norm}?fmt=json"
+        url = f"{EODHD_PUBLIC_URL}/eod/{ticker_norm}"
+        params = {"fmt": "json", **range_params}
         if API_KEY:
-            url += f"&api_token={API_KEY}"
-        if from_date and to_date:
-            url += f"&from={from_date}&to={to_date}"
-        r = requests.get(url, timeout=8)
+            params["api_token"] = API_KEY
+        r = http_get(url, params=params, timeout=8)
         if r.status_code == 200:
-            return _to_df_from_json_list(r.json())
+            return _slice_df(_to_df_from_json_list(r.json()), from_date, to_date)
     except Exception:
         pass
 
@@ -186,6 +209,52 @@ def fetch_fundamentals(ticker):
     # 3) Si no hay nada, devolver dict vacío y lista vacía
     return {}, []
 
+# -----------------------------
+# DESCARGAS MULTI-TICKER (concurrentes)
+# -----------------------------
+def fetch_many(fn, tickers, max_workers=FETCH_MAX_WORKERS, is_valid=None, **kwargs):
+    """
+    Ejecuta fn(ticker, **kwargs) para varios tickers en paralelo (pool de threads acotado).
+    Devuelve (results, errors):
+    - results: {ticker: resultado} para los que devolvieron datos
+    - errors: {ticker: mensaje} para los que fallaron o vinieron vacíos
+    """
+    unique = []
+    for t in tickers or []:
+        if t and t not in unique:
+            unique.append(t)
+
+    results, errors = {}, {}
+    if not unique:
+        return results, errors
+
+    workers = max(1, min(max_workers or 1, len(unique)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {t: pool.submit(fn, t, **kwargs) for t in unique}
+        for t, fut in futures.items():
+            try:
+                res = fut.result()
+            except Exception as e:
+                errors[t] = str(e) or e.__class__.__name__
+                continue
+            if is_valid is not None and not is_valid(res):
+                errors[t] = "sin datos"
+                continue
+            results[t] = res
+
+    return results, errors
+
+
+def fetch_ohlc_many(tickers, from_date=None, to_date=None, max_workers=FETCH_MAX_WORKERS):
+    """
+    Versión batch de fetch_ohlc. Devuelve ({ticker: DataFrame}, {ticker: error}).
+    """
+    return fetch_many(
+        fetch_ohlc, tickers, max_workers=max_workers,
+        is_valid=lambda df: df is not None and not df.empty,
+        from_date=from_date, to_date=to_date
+    )
+
 # -----------------------------
 # NOTICIAS
 # -----------------------------
@@ -198,9 +267,17 @@ def fetch_news(ticker, days_back=NEWS_DAYS_BACK, translate_to_es=True):
     # 1) EODHD
     if EOD_AVAILABLE and API_KEY:
         try:
+            start = (date.today() - timedelta(days=days_back)).isoformat()
+            end = date.today().isoformat()
+            if "eod_request_stream" in globals():
+                # streaming: se cortan los primeros 50 items sin parsear el resto
+                news = eod_request_stream(
+                    "news", {"s": ticker_norm, "from": start, "to": end, "limit": 50},
+                    decoder=decode_news_stream, cache=True
+                )
+                if news is not None:
+                    return news
             if "eod_request" in globals():
-                start = (date.today() - timedelta(days=days_back)).isoformat()
-                end = date.today().isoformat()
                 res = eod_request(f"news?symbols={ticker_norm}&from={start}&to={end}")
                 # eodhd puede devolver lista o dict con "data"
                 if isinstance(res, dict) and res.get("data"):
@@ -225,8 +302,9 @@ def fetch_news(ticker, days_back=NEWS_DAYS_BACK, translate_to_es=True):
             pass
 
     # 2) DEMO
-    if ticker_norm in DEMO_NEWS:
-        return DEMO_NEWS[ticker_norm]
+    news = demo_news(ticker_norm)
+    if news:
+        return news
 
     return []
 
@@ -241,17 +319,18 @@ def fetch_historical_data(ticker, period="1y", interval="1d"):
     period_map = {"1m":30,"3m":90,"6m":180,"1y":365,"2y":730,"5y":1825}
     days = period_map.get(period, 365)
 
-    # 1) si fetch_eodhd disponible, pedir limit=days
+    # 1) si fetch_eodhd disponible, pedir limit=days acotado por fecha
     if EOD_AVAILABLE and API_KEY and "fetch_eodhd" in globals():
         try:
-            data = fetch_eodhd(ticker, interval=interval, limit=days)
+            data = fetch_eodhd(ticker, interval=interval, limit=days,
+                               from_date=date.today() - timedelta(days=days))
             if isinstance(data, list):
                 return data
         except Exception:
             pass
 
     # 2) intentar usar fetch_ohlc y convertir a lista de dicts (lo más seguro)
-    df = fetch_ohlc(ticker)
+    df = fetch_ohlc(ticker, from_date=date.today() - timedelta(days=days))
     if df is not None and not df.empty:
         # tomar últimos `days` rows
         df2 = df.tail(days).copy()
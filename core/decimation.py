@@ -0,0 +1,137 @@
+# core/decimation.py
+import numpy as np
+import pandas as pd
+
+"""
+Decimación de series para gráficos: al navegador se mandan tantos puntos como
+entren en el ancho del gráfico, no tantos como tenga la historia.
+- Líneas: LTTB (Largest-Triangle-Three-Buckets), agregando además el máximo y el
+  mínimo global para que ningún pico o valle desaparezca.
+- Velas: baldes contiguos min/max (open del primero, high máximo, low mínimo,
+  close del último), así cada mecha conserva el extremo real del tramo.
+El tamaño del payload queda acotado por el presupuesto de puntos.
+"""
+
+# ancho por defecto (st.plotly_chart con use_container_width no informa el real)
+DEFAULT_CHART_WIDTH = 1200
+LINE_POINTS_PER_PX = 1.0
+# pixeles mínimos por vela para que se distinga cuerpo y mecha
+CANDLE_PX = 4
+MIN_POINTS = 10
+
+
+def point_budget(width_px=DEFAULT_CHART_WIDTH, kind="line"):
+    """
+    Cantidad máxima de puntos (kind="line") o velas (kind="candle") para un
+    gráfico de width_px pixeles.
+    """
+    width_px = int(width_px or DEFAULT_CHART_WIDTH)
+    if kind == "candle":
+        return max(MIN_POINTS, width_px // CANDLE_PX)
+    return max(MIN_POINTS, int(width_px * LINE_POINTS_PER_PX))
+
+
+# ======================================================
+# LÍNEAS (LTTB)
+# ======================================================
+def _as_float(x):
+    x = np.asarray(x)
+    if x.dtype.kind == "M":
+        return x.astype("datetime64[ns]").view("i8").astype("float64")
+    return x.astype("float64")
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Índices (sobre la serie original) que elige LTTB; siempre incluye el primer
+    y el último punto válido. Los NaN de y se ignoran.
+    """
+    y = _as_float(y)
+    valid = np.flatnonzero(~np.isnan(y))
+    n = len(valid)
+    if n <= max(n_out, 2):
+        return valid
+    if n_out < 3:
+        return valid[[0, -1]]
+
+    xs = _as_float(x)[valid]
+    ys = y[valid]
+    # n_out - 2 baldes entre el primer y el último punto
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    chosen = np.empty(n_out, dtype=int)
+    chosen[0], chosen[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # tercer vértice: promedio del balde siguiente (el último punto al final)
+        nhi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = xs[hi:nhi].mean(), ys[hi:nhi].mean()
+        area = np.abs((xs[a] - avg_x) * (ys[lo:hi] - ys[a]) - (xs[a] - xs[lo:hi]) * (avg_y - ys[a]))
+        a = lo + int(np.argmax(area))
+        chosen[i + 1] = a
+    return valid[chosen]
+
+
+def _line_indices(x, y, n_out):
+    idx = lttb_indices(x, y, n_out)
+    if len(idx):
+        idx = np.union1d(idx, [int(np.nanargmax(y)), int(np.nanargmin(y))])
+    return idx
+
+
+def decimate_line(x, y, n_out):
+    """
+    (x, y) reducidos a unos n_out puntos con LTTB, conservando máximo y mínimo.
+    Devuelve arrays NumPy (sin cambios si ya entran en el presupuesto).
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype="float64")
+    if len(y) <= n_out:
+        return x, y
+    idx = _line_indices(x, y, n_out)
+    return x[idx], y[idx]
+
+
+def decimate_frame(df, columns, n_out, x="date"):
+    """
+    Filas de df elegidas por LTTB para cualquiera de `columns` (unión de índices),
+    para dibujar varias líneas sobre el mismo eje x.
+    """
+    if df is None or len(df) <= n_out:
+        return df
+    xs = df[x].to_numpy()
+    idx = np.empty(0, dtype=int)
+    for col in columns:
+        y = df[col].to_numpy(dtype="float64")
+        idx = np.union1d(idx, _line_indices(xs, y, n_out))
+    return df.iloc[idx].reset_index(drop=True)
+
+
+# ======================================================
+# VELAS (MIN/MAX POR BALDE)
+# ======================================================
+def decimate_candles(df, n_out):
+    """
+    Agrupa velas contiguas en n_out baldes. Cada balde queda fechado en su
+    primera vela; columnas extra numéricas (SMA20, EMA20...) toman el último valor.
+    """
+    if df is None or len(df) <= n_out:
+        return df
+    n = len(df)
+    starts = np.unique(np.linspace(0, n, n_out, endpoint=False).astype(int))
+    ends = np.r_[starts[1:], n] - 1
+
+    out = {}
+    for col in df.columns:
+        values = df[col].to_numpy()
+        if col in ("date", "open"):
+            out[col] = values[starts]
+        elif col == "high":
+            out[col] = np.fmax.reduceat(values.astype("float64"), starts)
+        elif col == "low":
+            out[col] = np.fmin.reduceat(values.astype("float64"), starts)
+        elif col == "volume":
+            out[col] = np.add.reduceat(values, starts)
+        elif values.dtype.kind in "fiu":
+            out[col] = values[ends]
+    return pd.DataFrame(out)
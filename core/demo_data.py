@@ -0,0 +1,167 @@
+# core/demo_data.py
+import functools
+import zlib
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+"""
+Proveedor único de datos DEMO (sin API).
+- Las series se generan recién cuando se piden (nada a nivel de import).
+- Son deterministas: la semilla sale del ticker, así cada rerun de Streamlit
+  muestra el mismo gráfico y distintos rangos son cortes de la misma serie.
+- Quedan memoizadas por (ticker, día) y por (ticker, rango).
+"""
+
+# ======================================================
+# UNIVERSO DEMO
+# ======================================================
+STOCK_TICKERS = {
+    "Microsoft": "MSFT.US",
+    "Apple": "AAPL.US",
+    "Google": "GOOGL.US",
+    "Amazon": "AMZN.US",
+    "Galicia": "GGAL.BA"
+}
+
+CRYPTO_TICKERS = {
+    "Bitcoin": "BTC.CRYPTO",
+    "Ethereum": "ETH.CRYPTO",
+    "Solana": "SOL.CRYPTO"
+}
+
+ETF_TICKERS = {
+    "Tech ETF": "ETF.TECH",
+    "Global ETF": "ETF.GLOBAL",
+    "AI ETF": "ETF.AI"
+}
+
+DEMO_TICKERS = set(STOCK_TICKERS.values()) | set(CRYPTO_TICKERS.values()) | set(ETF_TICKERS.values())
+
+# Desde cuándo existe la serie demo de cada ticker
+DEMO_START = date(2015, 1, 1)
+MIN_DEMO_DAYS = 30
+
+# Precio de referencia al día de hoy (el resto se deriva de la semilla)
+DEMO_BASE_PRICE = {
+    "MSFT.US": 300.0,
+    "GGAL.BA": 90.0,
+    "BTC.CRYPTO": 40000.0,
+    "ETH.CRYPTO": 2500.0,
+}
+
+DEMO_NEWS_ITEMS = {
+    "MSFT.US": [
+        ("Microsoft reports strong quarterly earnings", "Microsoft beat expectations.", 1),
+        ("Azure growth accelerates", "Cloud business continues to expand.", 3),
+    ],
+    "GGAL.BA": [
+        ("Grupo Galicia posts solid retail results", "Positive numbers in consumer loans.", 2),
+    ],
+}
+
+
+def is_demo_ticker(ticker):
+    return ticker.upper() in DEMO_TICKERS
+
+
+def _seed(ticker):
+    # crc32 es estable entre procesos (hash() de Python no lo es)
+    return zlib.crc32(ticker.upper().encode("utf-8"))
+
+
+# ======================================================
+# GENERACIÓN
+# ======================================================
+@functools.lru_cache(maxsize=64)
+def _base_series(ticker, end_day):
+    """
+    Serie completa DEMO_START..end_day del ticker (OHLCV + SMA20 + EMA20).
+    Cripto cotiza 7 días; el resto solo días hábiles.
+    """
+    ticker = ticker.upper()
+    rng = np.random.default_rng(_seed(ticker))
+    crypto = ticker.endswith(".CRYPTO")
+
+    freq = "D" if crypto else "B"
+    dates = pd.date_range(DEMO_START, end_day, freq=freq)
+    n = len(dates)
+
+    base = DEMO_BASE_PRICE.get(ticker, 20.0 + _seed(ticker) % 400)
+    vol = 0.035 if crypto else 0.015
+    drift = 0.0002
+
+    # anclada al final: el precio "de hoy" queda cerca del de referencia
+    log_path = np.cumsum(rng.normal(drift, vol, n))
+    close = base * np.exp(log_path - log_path[-1])
+    open_ = np.empty(n)
+    open_[0] = close[0]
+    open_[1:] = close[:-1] * (1 + rng.normal(0, vol / 3, n - 1))
+    top = np.maximum(open_, close)
+    bottom = np.minimum(open_, close)
+    high = top * (1 + np.abs(rng.normal(0, vol / 2, n)))
+    low = bottom * (1 - np.abs(rng.normal(0, vol / 2, n)))
+    volume = rng.lognormal(13 if not crypto else 15, 0.4, n).astype("int64")
+
+    df = pd.DataFrame({
+        "date": dates,
+        "open": open_,
+        "high": high,
+        "low": low,
+        "close": close,
+        "volume": volume,
+    })
+    df["SMA20"] = df["close"].rolling(20).mean()
+    df["EMA20"] = df["close"].ewm(span=20).mean()
+    return df
+
+
+@functools.lru_cache(maxsize=256)
+def _demo_slice(ticker, start, end, today):
+    df = _base_series(ticker, today)
+    if start > end:
+        start, end = end, start
+    if (end - start).days < MIN_DEMO_DAYS:
+        start = end - timedelta(days=MIN_DEMO_DAYS)
+    lo = df["date"].searchsorted(pd.Timestamp(start))
+    hi = df["date"].searchsorted(pd.Timestamp(end), side="right")
+    return df.iloc[lo:hi].reset_index(drop=True)
+
+
+def _as_date(d, default):
+    if d is None:
+        return default
+    return pd.Timestamp(d).date()
+
+
+def demo_ohlc(ticker, start=None, end=None):
+    """
+    DataFrame OHLCV (+ SMA20, EMA20) DEMO para el ticker en [start, end].
+    Mismo ticker y rango -> mismos datos en cada llamada.
+    """
+    today = date.today()
+    end = min(_as_date(end, today), today)
+    start = _as_date(start, end - timedelta(days=365))
+    # copia: el resultado memoizado no se debe modificar desde afuera
+    return _demo_slice(ticker.upper(), start, end, today).copy()
+
+
+@functools.lru_cache(maxsize=64)
+def _demo_news(ticker, today):
+    items = DEMO_NEWS_ITEMS.get(ticker, [])
+    now = datetime.combine(today, datetime.now().time())
+    return tuple(
+        (title, content, (now - timedelta(days=days_ago)).isoformat())
+        for title, content, days_ago in items
+    )
+
+
+def demo_news(ticker):
+    """
+    Noticias DEMO (lista de dicts title/content/published_at) o [] si no hay.
+    """
+    return [
+        {"title": t, "content": c, "published_at": p}
+        for t, c, p in _demo_news(ticker.upper(), date.today())
+    ]
@@ -1,36 +1,192 @@
 import os
-import requests
+import threading
+from core.http_client import http_get
+from core.rate_limiter import acquire
+from core.cache_manager import TieredCache
+from core.json_stream import STREAM_CHUNK_SIZE
+from core.config import (
+    EODHD_BASE_URL, CACHE_DIR, CACHE_TTLS, CACHE_DEFAULT_TTL, CACHE_MEMORY_ITEMS, CACHE_MAX_STALE
+)
 
 EOD_API_KEY = os.getenv("EODHD_API_KEY", "")
 
-BASE_URL = "https://eodhd.com/api"
+BASE_URL = EODHD_BASE_URL
 
+# Familia de cache / TTL por prefijo de endpoint
+ENDPOINT_FAMILIES = {
+    "eod": "eod",
+    "historical-prices": "eod",
+    "fundamentals": "fundamentals",
+    "financials": "fundamentals",
+    "news": "news",
+    "screener": "screener",
+    "screening": "screener",
+}
 
-def eod_request(endpoint: str, params: dict = None):
+response_cache = TieredCache(
+    CACHE_DIR, CACHE_TTLS,
+    default_ttl=CACHE_DEFAULT_TTL,
+    max_items=CACHE_MEMORY_ITEMS,
+    max_stale=CACHE_MAX_STALE,
+)
+
+
+def endpoint_family(endpoint):
+    prefix = (endpoint or "").split("?")[0].split("/")[0]
+    return ENDPOINT_FAMILIES.get(prefix, "other")
+
+
+# -----------------------------
+# SINGLE-FLIGHT (coalescing de requests idénticos)
+# -----------------------------
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.waiters = 0
+
+
+_inflight = {}
+_inflight_lock = threading.Lock()
+_flight_stats = {"calls": 0, "executed": 0, "deduplicated": 0}
+
+
+def _request_key(endpoint, params):
+    # api_token/fmt no cambian el contenido: se excluyen de la clave
+    items = sorted((k, str(v)) for k, v in params.items() if k not in ("api_token", "fmt"))
+    return endpoint, tuple(items)
+
+
+def _single_flight(key, fn):
+    """
+    Si ya hay una llamada en curso con la misma clave, espera su resultado
+    en lugar de lanzar otra. Solo el primer llamador ("leader") ejecuta fn().
+    """
+    with _inflight_lock:
+        _flight_stats["calls"] += 1
+        call = _inflight.get(key)
+        if call is not None:
+            call.waiters += 1
+            _flight_stats["deduplicated"] += 1
+            leader = False
+        else:
+            call = _Call()
+            _inflight[key] = call
+            _flight_stats["executed"] += 1
+            leader = True
+
+    if not leader:
+        call.done.wait()
+        return call.result
+
+    try:
+        call.result = fn()
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+        call.done.set()
+    return call.result
+
+
+def single_flight_stats():
+    """
+    Contadores del single-flight:
+    - calls: llamadas a eod_request
+    - executed: requests HTTP realmente lanzados
+    - deduplicated: llamadas que reutilizaron un request en curso
+    - inflight: requests en curso en este momento
+    """
+    with _inflight_lock:
+        stats = dict(_flight_stats)
+        stats["inflight"] = len(_inflight)
+    return stats
+
+
+def _do_request(endpoint, url, params):
+    # Solo el request real consume cuota (los deduplicados no)
+    if not acquire(endpoint):
+        return None
+    try:
+        response = http_get(url, params=params, timeout=10)
+        response.raise_for_status()
+        return response.json()
+    except Exception:
+        return None
+
+
+def eod_request(endpoint: str, params: dict = None, cache=True):
     """
     Wrapper seguro para realizar solicitudes a EODHD.
     Si no hay API KEY o la API falla, devuelve None sin romper la app.
+    Requests idénticos concurrentes (mismo endpoint y params) comparten una sola llamada;
+    el resultado es compartido, no modificarlo in-place.
+    Las respuestas pasan por response_cache (memoria + disco, TTL por familia);
+    con cache=False se va siempre a la API (datos que tienen que estar al día,
+    ej. el bulk nocturno, donde un valor viejo del cache no sirve).
     """
-    if params is None:
-        params = {}
+    params = dict(params) if params else {}
 
     params["api_token"] = EOD_API_KEY
     params["fmt"] = "json"
 
     url = f"{BASE_URL}/{endpoint}"
+    key = _request_key(endpoint, params)
+
+    def fetch():
+        return _single_flight(key, lambda: _do_request(endpoint, url, params))
+
+    if cache:
+        return response_cache.get_or_fetch(key, endpoint_family(endpoint), fetch)
+    return fetch()
+
 
+def _do_stream_request(endpoint, url, params, decoder):
+    if not acquire(endpoint):
+        return None
     try:
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        return response.json()
+        with http_get(url, params=params, timeout=30, stream=True) as response:
+            response.raise_for_status()
+            return decoder(response.iter_content(chunk_size=STREAM_CHUNK_SIZE))
     except Exception:
         return None
 
 
-def fetch_eodhd(symbol: str, interval: str = "1d", limit: int = 100):
+def eod_request_stream(endpoint: str, params: dict = None, decoder=None, cache=False):
+    """
+    Como eod_request, pero decodifica la respuesta en streaming con decoder(chunks)
+    (ver core/json_stream.py) en lugar de response.json().
+    Por defecto no pasa por response_cache (respuestas grandes que se guardan en otro lado,
+    ej. store de OHLC); con cache=True se cachea el resultado decodificado, que debe ser
+    serializable a JSON. Devuelve None si la API falla.
+    """
+    params = dict(params) if params else {}
+
+    params["api_token"] = EOD_API_KEY
+    params["fmt"] = "json"
+
+    url = f"{BASE_URL}/{endpoint}"
+    key = ("stream", getattr(decoder, "__name__", repr(decoder))) + _request_key(endpoint, params)
+
+    def fetch():
+        return _single_flight(key, lambda: _do_stream_request(endpoint, url, params, decoder))
+
+    if cache:
+        return response_cache.get_or_fetch(key, endpoint_family(endpoint), fetch)
+    return fetch()
+
+
+def cache_stats():
+    """
+    Estadísticas del cache de respuestas (hits, misses, stale, evictions...).
+    """
+    return response_cache.get_stats()
+
+
+def fetch_eodhd(symbol: str, interval: str = "1d", limit: int = 100, from_date=None, to_date=None):
     """
     Función estandarizada que la app espera.
     Devuelve datos históricos del ticker usando el wrapper eod_request.
+    Si se pasa from_date/to_date, el rango se filtra del lado del servidor.
     """
     endpoint = f"eod/{symbol}.US"
 
@@ -38,6 +194,10 @@ def fetch_eodhd(symbol: str, interval: str = "1d", limit: int = 100):
         "period": interval,  # "1d", "1w", etc.
         "limit": limit
     }
+    if from_date:
+        params["from"] = str(from_date)
+    if to_date:
+        params["to"] = str(to_date)
 
     data = eod_request(endpoint, params)
 
@@ -21,6 +21,13 @@ def _load_all():
     except Exception:
         return {}
 
+def load_all_favorites():
+    """
+    Favoritos de todos los usuarios: {username: {"all": [...], "categories": {...}}}
+    (o lista simple en versiones viejas). Solo lectura, ej. para el refresco masivo.
+    """
+    return _load_all()
+
 def _save_all(data):
     os.makedirs(os.path.dirname(FAV_PATH), exist_ok=True)
     with open(FAV_PATH, "w", encoding="utf-8") as f:
@@ -0,0 +1,88 @@
+# core/figure_cache.py
+import threading
+from collections import OrderedDict
+
+from core.config import FIGURE_CACHE_ITEMS
+
+"""
+Cache de figuras Plotly ya armadas.
+Streamlit re-ejecuta el script en cada interacción: si ni los datos ni el rango
+cambiaron, se reutiliza el mismo go.Figure sin cargar datos, agregar la pirámide,
+decimar ni armar trazas.
+- Clave: (tipo de gráfico, ticker, rango, resolución, indicadores, revisión de los
+  datos, ancho), armada antes de tocar los datos: un hit no recorre ninguna serie.
+  La revisión la da quien llama (ohlc_store.store_revision, o la fecha para los
+  datos demo) y cambia cuando cambian las barras.
+- Se guarda el go.Figure y no su JSON: la API pública de st.plotly_chart no acepta
+  JSON ya serializado y siempre serializa lo que recibe; con un dict además
+  reconstruye y valida la figura entera, con un Figure solo la convierte. La
+  serialización que queda en cada rerun está acotada por la decimación
+  (core.decimation), no por el largo de la historia.
+- LRU en memoria por cantidad de figuras.
+"""
+
+
+def figure_key(kind, ticker, start, end, resolution, indicators, revision, width=None):
+    """
+    Clave de cache para un gráfico. No recibe datos: revision identifica la
+    versión de las barras (ver arriba).
+    """
+    return (
+        kind,
+        ticker if isinstance(ticker, str) else tuple(ticker),
+        str(start) if start is not None else None,
+        str(end) if end is not None else None,
+        resolution,
+        tuple(indicators or ()),
+        revision,
+        width,
+    )
+
+
+class FigureCache:
+    """
+    LRU de figuras (go.Figure). Quien las recibe no debe modificarlas.
+    """
+
+    def __init__(self, max_items):
+        self.max_items = max_items
+        self._mem = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get_or_build(self, key, build_fn):
+        """
+        Figura cacheada para key; si no está, la arma build_fn().
+        """
+        with self._lock:
+            fig = self._mem.get(key)
+            if fig is not None:
+                self._mem.move_to_end(key)
+                self.stats["hits"] += 1
+                return fig
+            self.stats["misses"] += 1
+
+        fig = build_fn()
+
+        with self._lock:
+            self._mem[key] = fig
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.max_items:
+                self._mem.popitem(last=False)
+                self.stats["evictions"] += 1
+        return fig
+
+    def clear(self):
+        with self._lock:
+            self._mem.clear()
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["items"] = len(self._mem)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
+
+
+figure_cache = FigureCache(FIGURE_CACHE_ITEMS)
@@ -3,9 +3,11 @@ import os
 from datetime import datetime, timedelta
 from core.eodhd_api import eod_request
 from core.cache_manager import cache_load, cache_save
-import requests
+from core.http_client import http_get
+from core.data_fetch import fetch_many
+from core.config import FETCH_MAX_WORKERS, ALPHAVANTAGE_URL
 
-API_URL = "https://www.alphavantage.co/query"
+API_URL = ALPHAVANTAGE_URL
 API_KEY = "demo"   # poné tu key real
 
 def fetch_fundamentals(ticker):
@@ -19,7 +21,7 @@ def fetch_fundamentals(ticker):
     }
 
     try:
-        r = requests.get(API_URL, params=params, timeout=10)
+        r = http_get(API_URL, params=params, timeout=10)
         data = r.json()
     except:
         return {}, []
@@ -56,6 +58,18 @@ def fetch_fundamentals(ticker):
     return fundamentals, competitors
 
 
+def fetch_fundamentals_many(tickers, max_workers=FETCH_MAX_WORKERS):
+    """
+    Descarga fundamentals de varios tickers en paralelo: fetch_fundamentals de este
+    módulo sobre data_fetch.fetch_many (el fan-out compartido).
+    Devuelve ({ticker: (fundamentals, competitors)}, {ticker: error}).
+    """
+    return fetch_many(
+        fetch_fundamentals, tickers, max_workers=max_workers,
+        is_valid=lambda res: bool(res and res[0])
+    )
+
+
 def safe_float(v):
     try:
         return float(v)
@@ -0,0 +1,129 @@
+# core/http_client.py
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+"""
+Cliente HTTP compartido por todo el proceso.
+- Reutiliza conexiones (keep-alive) entre eod_request, fetch_ohlc y fetch_fundamentals.
+- Acepta gzip para achicar las respuestas.
+- Reintenta con backoff (y jitter) ante 429 / 5xx.
+- Expone estadísticas del pool (hits / misses) para dimensionarlo.
+"""
+
+# 📦 Parámetros del pool
+POOL_CONNECTIONS = 8      # hosts distintos que se mantienen en cache
+POOL_MAXSIZE = 16         # conexiones abiertas por host
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 0.5       # 0.5s, 1s, 2s...
+RETRY_JITTER = 0.3        # segundos aleatorios extra por intento
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+DEFAULT_HEADERS = {
+    "Accept": "application/json",
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+    "User-Agent": "AppFinanzAr/1.0",
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _build_retry():
+    kwargs = {
+        "total": RETRY_TOTAL,
+        "backoff_factor": RETRY_BACKOFF,
+        "status_forcelist": RETRY_STATUS,
+        "allowed_methods": frozenset(["GET", "HEAD"]),
+        "respect_retry_after_header": True,
+        "raise_on_status": False,
+    }
+    try:
+        # urllib3 >= 2 soporta jitter nativo
+        return Retry(backoff_jitter=RETRY_JITTER, **kwargs)
+    except TypeError:
+        return Retry(**kwargs)
+
+
+def get_session():
+    """
+    Devuelve la sesión global (se crea una sola vez, thread-safe).
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                s = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=POOL_CONNECTIONS,
+                    pool_maxsize=POOL_MAXSIZE,
+                    max_retries=_build_retry(),
+                    pool_block=False,
+                )
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                s.headers.update(DEFAULT_HEADERS)
+                _session = s
+    return _session
+
+
+def http_get(url, params=None, timeout=10, stream=False):
+    """
+    GET usando el pool compartido. Devuelve el objeto Response
+    (el manejo de errores queda del lado de quien llama, como antes con requests.get).
+    Con stream=True el body no se descarga hasta iterar response.iter_content().
+    """
+    return get_session().get(url, params=params, timeout=timeout, stream=stream)
+
+
+def pool_stats():
+    """
+    Estadísticas del pool por host:
+    - requests: pedidos servidos
+    - connections: conexiones nuevas abiertas (misses)
+    - hits: pedidos que reutilizaron una conexión existente
+    """
+    stats = {"requests": 0, "connections": 0, "hits": 0, "misses": 0, "hosts": {}}
+    if _session is None:
+        return stats
+
+    seen = set()
+    for adapter in _session.adapters.values():
+        if id(adapter) in seen:
+            continue
+        seen.add(id(adapter))
+        manager = getattr(adapter, "poolmanager", None)
+        if manager is None:
+            continue
+        try:
+            pools = list(manager.pools._container.items())
+        except Exception:
+            continue
+        for key, pool in pools:
+            n_req = getattr(pool, "num_requests", 0)
+            n_conn = getattr(pool, "num_connections", 0)
+            host = f"{getattr(key, 'key_scheme', '')}://{getattr(key, 'key_host', '')}"
+            stats["hosts"][host] = {
+                "requests": n_req,
+                "connections": n_conn,
+                "hits": max(n_req - n_conn, 0),
+            }
+            stats["requests"] += n_req
+            stats["connections"] += n_conn
+
+    stats["misses"] = stats["connections"]
+    stats["hits"] = max(stats["requests"] - stats["connections"], 0)
+    return stats
+
+
+def close_session():
+    """
+    Cierra el pool (útil en tests o al apagar el proceso).
+    """
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
@@ -0,0 +1,126 @@
+# core/indicator_cache.py
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from core.config import INDICATOR_CACHE_BYTES
+
+"""
+Memoización de indicadores calculados.
+- Clave: (ticker, huella del contenido de la serie, indicador, parámetros).
+  La huella es un hash de fechas + valores, así un rango distinto o un dato
+  corregido dan otra clave y nunca se devuelve un resultado viejo.
+- LRU con presupuesto en bytes (no en cantidad de entradas).
+- Los valores se guardan como arrays de solo lectura y se entregan copias.
+"""
+
+
+def series_fingerprint(series, index=None):
+    """
+    Hash del contenido de una serie (valores + índice/fechas).
+    """
+    h = hashlib.blake2b(digest_size=16)
+    values = np.ascontiguousarray(np.asarray(series, dtype="float64"))
+    h.update(values.tobytes())
+    if index is None and isinstance(series, pd.Series):
+        index = series.index
+    if index is not None:
+        idx = np.asarray(index)
+        if idx.dtype.kind in "iumM":
+            h.update(np.ascontiguousarray(idx).view("u1").tobytes())
+        else:
+            h.update(repr(idx.tolist()).encode("utf-8"))
+    return h.hexdigest()
+
+
+class IndicatorCache:
+    """
+    Cache LRU de resultados de indicadores (arrays NumPy) acotada en bytes.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._mem = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "too_large": 0}
+
+    def get_or_compute(self, key, compute_fn):
+        """
+        Devuelve una copia del resultado cacheado para key o lo calcula con compute_fn().
+        """
+        with self._lock:
+            value = self._mem.get(key)
+            if value is not None:
+                self._mem.move_to_end(key)
+                self.stats["hits"] += 1
+                return value.copy()
+            self.stats["misses"] += 1
+
+        value = np.array(compute_fn(), dtype="float64")
+        value.setflags(write=False)
+        size = value.nbytes
+
+        with self._lock:
+            if size > self.max_bytes:
+                self.stats["too_large"] += 1
+                return value.copy()
+            old = self._mem.pop(key, None)
+            if old is not None:
+                self.bytes -= old.nbytes
+            self._mem[key] = value
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, evicted = self._mem.popitem(last=False)
+                self.bytes -= evicted.nbytes
+                self.stats["evictions"] += 1
+        return value.copy()
+
+    def contains(self, key):
+        with self._lock:
+            return key in self._mem
+
+    def clear(self):
+        with self._lock:
+            self._mem.clear()
+            self.bytes = 0
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["items"] = len(self._mem)
+            stats["bytes"] = self.bytes
+            stats["max_bytes"] = self.max_bytes
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
+
+
+indicator_cache = IndicatorCache(INDICATOR_CACHE_BYTES)
+
+
+def _key(ticker, fp, indicator, params):
+    return (ticker or "", fp, indicator, tuple(sorted(params.items())) if isinstance(params, dict) else params)
+
+
+def cached_indicator(ticker, series, indicator, params, compute_fn, fingerprint=None):
+    """
+    Resultado de compute_fn() memoizado por (ticker, contenido de series, indicador, params).
+    Pasar fingerprint evita re-hashear la misma serie para varios indicadores.
+    """
+    fp = fingerprint or series_fingerprint(series)
+    return indicator_cache.get_or_compute(_key(ticker, fp, indicator, params), compute_fn)
+
+
+def is_cached(ticker, fingerprint, indicator, params):
+    return indicator_cache.contains(_key(ticker, fingerprint, indicator, params))
+
+
+def indicator_cache_stats():
+    """
+    Estadísticas del cache de indicadores (hits, misses, evictions, bytes usados).
+    """
+    return indicator_cache.get_stats()
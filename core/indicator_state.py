@@ -0,0 +1,391 @@
+# core/indicator_state.py
+import math
+import os
+import threading
+import zlib
+from collections import deque
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from core import ohlc_store
+from core.cache_manager import cache_load, cache_save
+
+"""
+Indicadores incrementales: cada barra nueva cuesta O(1).
+- SMA: suma de ventana móvil (se suma la barra nueva y se resta la que sale).
+- EMA: se arrastra el último valor (y el peso acumulado si adjust=True).
+- RSI: suma de ganancias/pérdidas de la ventana (como core.utils.rsi)
+  o medias de Wilder (rsi_method="wilder").
+El estado se guarda junto al store de OHLC (data/ohlc_store/indicators/),
+con la serie de valores ya calculados en un archivo binario de registros fijos
+al que solo se le agregan filas: el refresco diario de un universo grande
+procesa y escribe solo la barra del día.
+Reescrituras de la historia ya procesada se detectan sin releerla: cantidad de
+barras, última fecha, crc32 de las últimas TAIL_CHECK_BARS barras y la revisión
+que ohlc_store.merge_ohlc sube cuando toca barras viejas.
+"""
+
+INDICATORS_DIR = "indicators"
+STATE_VERSION = 2
+# barras finales ya procesadas que se comparan contra el store en cada actualización
+TAIL_CHECK_BARS = 32
+# cada cuántas barras se recalculan las sumas desde el buffer (evita deriva de redondeo)
+RESYNC_EVERY = 1000
+
+_lock = threading.Lock()
+
+
+class IndicatorState:
+    """
+    Estado incremental de SMA/EMA/RSI para una serie de cierres.
+    Por defecto produce las columnas de compare_pro.prepare_indicators
+    (SMA20, SMA50, EMA20 con adjust=True, RSI14 con medias simples).
+    """
+
+    def __init__(self, sma=(20, 50), ema=(20,), rsi=(14,), rsi_method="sma", ema_adjust=True):
+        if rsi_method not in ("sma", "wilder"):
+            raise ValueError(f"rsi_method inválido: {rsi_method!r}")
+        self.sma_windows = tuple(int(w) for w in sma)
+        self.ema_spans = tuple(int(s) for s in ema)
+        self.rsi_periods = tuple(int(p) for p in rsi)
+        self.rsi_method = rsi_method
+        self.ema_adjust = bool(ema_adjust)
+
+        self.count = 0
+        self.last_date = None
+        self.last_close = None
+        self.updates_since_resync = 0
+        # crc32 de las últimas barras procesadas y revisión del store (detectan reescrituras)
+        self.tail_crc = 0
+        self.store_revision = 0
+
+        self.closes = deque(maxlen=max(self.sma_windows, default=1))
+        self.sma_sums = {w: 0.0 for w in self.sma_windows}
+        self.ema = {s: {"value": None, "weight": 0.0} for s in self.ema_spans}
+        self.rsi = {
+            p: {"gains": deque(maxlen=p), "losses": deque(maxlen=p),
+                "sum_gain": 0.0, "sum_loss": 0.0, "avg_gain": None, "avg_loss": None}
+            for p in self.rsi_periods
+        }
+
+    # ---------- nombres / valores ----------
+    @property
+    def names(self):
+        return ([f"SMA{w}" for w in self.sma_windows] +
+                [f"EMA{s}" for s in self.ema_spans] +
+                [f"RSI{p}" for p in self.rsi_periods])
+
+    def values(self):
+        out = {}
+        for w in self.sma_windows:
+            out[f"SMA{w}"] = self.sma_sums[w] / w if self.count >= w else math.nan
+        for s in self.ema_spans:
+            v = self.ema[s]["value"]
+            out[f"EMA{s}"] = v if v is not None else math.nan
+        for p in self.rsi_periods:
+            out[f"RSI{p}"] = self._rsi_value(p)
+        return out
+
+    def _rsi_value(self, p):
+        r = self.rsi[p]
+        if self.rsi_method == "wilder":
+            gain, loss = r["avg_gain"], r["avg_loss"]
+            if gain is None:
+                return math.nan
+        else:
+            if self.count < p + 1:
+                return math.nan
+            gain, loss = r["sum_gain"] / p, r["sum_loss"] / p
+        # sin pérdidas -> NaN, igual que core.utils.rsi
+        if loss <= 0:
+            return math.nan
+        return 100.0 - 100.0 / (1.0 + gain / loss)
+
+    # ---------- actualización O(1) ----------
+    def update(self, day, close):
+        """
+        Agrega una barra (day, close) y devuelve los valores de los indicadores.
+        Las barras deben llegar en orden de fecha.
+        """
+        close = float(close)
+        if self.last_date is not None and str(day) <= self.last_date:
+            raise ValueError(f"Barra fuera de orden: {day} <= {self.last_date}")
+
+        # SMA: la barra que sale de cada ventana
+        n = len(self.closes)
+        for w in self.sma_windows:
+            self.sma_sums[w] += close
+            if n >= w:
+                self.sma_sums[w] -= self.closes[n - w]
+        self.closes.append(close)
+
+        # EMA
+        for s in self.ema_spans:
+            e = self.ema[s]
+            alpha = 2.0 / (s + 1.0)
+            if e["value"] is None:
+                e["value"], e["weight"] = close, 1.0
+            elif self.ema_adjust:
+                prev_w = (1.0 - alpha) * e["weight"]
+                e["weight"] = 1.0 + prev_w
+                e["value"] = (close + prev_w * e["value"]) / e["weight"]
+            else:
+                e["value"] = alpha * close + (1.0 - alpha) * e["value"]
+
+        # RSI
+        if self.last_close is not None:
+            delta = close - self.last_close
+            gain, loss = max(delta, 0.0), max(-delta, 0.0)
+            for p in self.rsi_periods:
+                self._update_rsi(p, gain, loss)
+
+        self.count += 1
+        self.last_date = str(day)
+        self.last_close = close
+
+        self.updates_since_resync += 1
+        if self.updates_since_resync >= RESYNC_EVERY:
+            self._resync()
+        return self.values()
+
+    def _update_rsi(self, p, gain, loss):
+        r = self.rsi[p]
+        if self.rsi_method == "wilder" and r["avg_gain"] is not None:
+            r["avg_gain"] += (gain - r["avg_gain"]) / p
+            r["avg_loss"] += (loss - r["avg_loss"]) / p
+            return
+        if len(r["gains"]) == p:
+            r["sum_gain"] -= r["gains"][0]
+            r["sum_loss"] -= r["losses"][0]
+        r["gains"].append(gain)
+        r["losses"].append(loss)
+        r["sum_gain"] += gain
+        r["sum_loss"] += loss
+        if self.rsi_method == "wilder" and len(r["gains"]) == p:
+            # semilla de Wilder: media simple de las primeras p variaciones
+            r["avg_gain"], r["avg_loss"] = r["sum_gain"] / p, r["sum_loss"] / p
+
+    def _resync(self):
+        closes = list(self.closes)
+        for w in self.sma_windows:
+            self.sma_sums[w] = math.fsum(closes[-w:])
+        for r in self.rsi.values():
+            r["sum_gain"] = math.fsum(r["gains"])
+            r["sum_loss"] = math.fsum(r["losses"])
+        self.updates_since_resync = 0
+
+    def config(self):
+        return {
+            "sma": list(self.sma_windows), "ema": list(self.ema_spans), "rsi": list(self.rsi_periods),
+            "rsi_method": self.rsi_method, "ema_adjust": self.ema_adjust,
+        }
+
+    # ---------- persistencia ----------
+    def to_dict(self):
+        return {
+            "version": STATE_VERSION,
+            "config": self.config(),
+            "count": self.count,
+            "last_date": self.last_date,
+            "last_close": self.last_close,
+            "updates_since_resync": self.updates_since_resync,
+            "tail_crc": self.tail_crc,
+            "store_revision": self.store_revision,
+            "closes": list(self.closes),
+            "sma_sums": {str(w): v for w, v in self.sma_sums.items()},
+            "ema": {str(s): dict(e) for s, e in self.ema.items()},
+            "rsi": {
+                str(p): {
+                    "gains": list(r["gains"]), "losses": list(r["losses"]),
+                    "sum_gain": r["sum_gain"], "sum_loss": r["sum_loss"],
+                    "avg_gain": r["avg_gain"], "avg_loss": r["avg_loss"],
+                }
+                for p, r in self.rsi.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if not data or data.get("version") != STATE_VERSION:
+            return None
+        state = cls(**data["config"])
+        state.count = data["count"]
+        state.last_date = data["last_date"]
+        state.last_close = data["last_close"]
+        state.updates_since_resync = data.get("updates_since_resync", 0)
+        state.tail_crc = data.get("tail_crc", 0)
+        state.store_revision = data.get("store_revision", 0)
+        state.closes.extend(data["closes"])
+        state.sma_sums = {int(w): v for w, v in data["sma_sums"].items()}
+        state.ema = {int(s): dict(e) for s, e in data["ema"].items()}
+        for p, r in data["rsi"].items():
+            p = int(p)
+            state.rsi[p] = {
+                "gains": deque(r["gains"], maxlen=p), "losses": deque(r["losses"], maxlen=p),
+                "sum_gain": r["sum_gain"], "sum_loss": r["sum_loss"],
+                "avg_gain": r["avg_gain"], "avg_loss": r["avg_loss"],
+            }
+        return state
+
+
+# ======================================================
+# PERSISTENCIA JUNTO AL STORE DE OHLC
+# ======================================================
+def _dir():
+    return os.path.join(ohlc_store.STORE_DIR, INDICATORS_DIR)
+
+
+def _state_path(ticker):
+    return os.path.join(_dir(), f"{ohlc_store._safe_name(ticker)}.json")
+
+
+def _series_path(ticker):
+    return os.path.join(_dir(), f"{ohlc_store._safe_name(ticker)}.bin")
+
+
+def _series_dtype(names):
+    return np.dtype([("date", "datetime64[D]")] + [(n, "f8") for n in names])
+
+
+def load_state(ticker):
+    return IndicatorState.from_dict(cache_load(_state_path(ticker)))
+
+
+def _series_rows(ticker, dtype):
+    try:
+        return os.path.getsize(_series_path(ticker)) // dtype.itemsize
+    except OSError:
+        return 0
+
+
+def _load_series(ticker, dtype, rows):
+    """
+    Primeras rows filas de la serie guardada, con memory-map (None si no hay).
+    """
+    if rows <= 0:
+        return None
+    try:
+        return np.memmap(_series_path(ticker), dtype=dtype, mode="r", shape=(rows,))
+    except (OSError, ValueError):
+        return None
+
+
+def _write_series(ticker, arr):
+    """
+    Reescritura completa (solo al reconstruir): archivo temporal + os.replace.
+    """
+    os.makedirs(_dir(), exist_ok=True)
+    path = _series_path(ticker)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(arr.tobytes())
+    os.replace(tmp, path)
+
+
+def _append_series(ticker, arr, keep_rows):
+    """
+    Agrega filas al final. Si quedaron filas de una actualización interrumpida
+    (más filas que el estado guardado), primero se recortan.
+    """
+    with open(_series_path(ticker), "r+b") as f:
+        f.truncate(keep_rows * arr.dtype.itemsize)
+        f.seek(0, os.SEEK_END)
+        f.write(arr.tobytes())
+
+
+def _tail_crc(arr, end):
+    return zlib.crc32(np.ascontiguousarray(arr[max(0, end - TAIL_CHECK_BARS):end]).tobytes())
+
+
+def _run(state, dates, closes):
+    out = np.empty(len(dates), dtype=_series_dtype(state.names))
+    out["date"] = dates
+    for i, (d, c) in enumerate(zip(dates.astype(object), closes)):
+        for name, v in state.update(d, c).items():
+            out[name][i] = v
+    return out
+
+
+def update_indicators(ticker, **config):
+    """
+    Lleva los indicadores guardados del ticker hasta la última barra del store de OHLC.
+    Solo se procesan y se escriben las barras posteriores al estado guardado; si la
+    historia cambió por detrás (backfill, reescritura) o cambió la configuración,
+    se reconstruye todo. Devuelve la cantidad de barras procesadas.
+    """
+    arr = ohlc_store._load_array(ticker)
+    if arr is None or len(arr) == 0:
+        return 0
+
+    with _lock:
+        state = load_state(ticker)
+        wanted = IndicatorState(**config).config() if config else None
+        revision = ohlc_store.load_meta(ticker).get("revision", 0)
+        rows = _series_rows(ticker, _series_dtype(state.names)) if state is not None else 0
+
+        dates = arr["date"]
+        consumed = state.count if state is not None else 0
+        rebuild = (
+            state is None or consumed == 0 or rows < consumed
+            or (wanted is not None and wanted != state.config())
+            or state.store_revision != revision
+        )
+        if not rebuild:
+            # chequeos O(1): la cola ya procesada tiene que seguir igual en el store
+            rebuild = (
+                consumed > len(arr)
+                or dates[consumed - 1] != np.datetime64(state.last_date, "D")
+                or _tail_crc(arr, consumed) != state.tail_crc
+            )
+
+        if rebuild:
+            # sin config explícita se conserva la del estado guardado (no volver a los defaults)
+            state = IndicatorState(**(config or (state.config() if state is not None else {})))
+            consumed = 0
+
+        if consumed >= len(arr):
+            return 0
+
+        new = _run(state, dates[consumed:], np.asarray(arr["close"][consumed:], dtype="f8"))
+        state.tail_crc = _tail_crc(arr, len(arr))
+        state.store_revision = revision
+        if consumed == 0:
+            _write_series(ticker, new)
+        else:
+            _append_series(ticker, new, consumed)
+        cache_save(_state_path(ticker), state.to_dict())
+    return len(new)
+
+
+def load_indicators(ticker, from_date=None, to_date=None):
+    """
+    Serie de indicadores guardada (DataFrame date + columnas) en [from_date, to_date].
+    DataFrame vacío si todavía no se calcularon.
+    """
+    state = load_state(ticker)
+    if state is None:
+        return pd.DataFrame()
+    dtype = _series_dtype(state.names)
+    arr = _load_series(ticker, dtype, min(state.count, _series_rows(ticker, dtype)))
+    if arr is None or len(arr) == 0:
+        return pd.DataFrame()
+    dates = arr["date"]
+    lo, hi = 0, len(arr)
+    if from_date is not None:
+        lo = int(np.searchsorted(dates, np.datetime64(pd.Timestamp(from_date).date(), "D")))
+    if to_date is not None:
+        hi = int(np.searchsorted(dates, np.datetime64(pd.Timestamp(to_date).date(), "D"), side="right"))
+    part = arr[lo:hi]
+    return pd.DataFrame({n: (pd.to_datetime(part[n]) if n == "date" else part[n]) for n in arr.dtype.names})
+
+
+def latest_indicators(ticker):
+    """
+    Últimos valores guardados ({"date": ..., "SMA20": ..., ...}) o None.
+    """
+    state = load_state(ticker)
+    if state is None or state.count == 0:
+        return None
+    return {"date": date.fromisoformat(state.last_date), **state.values()}
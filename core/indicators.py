@@ -0,0 +1,247 @@
+# core/indicators.py
+import re
+
+import numpy as np
+import pandas as pd
+
+from core.panel import as_matrix, compact_panel, expand_panel, tail_mask
+
+"""
+Motor vectorizado de indicadores sobre un panel fecha x ticker.
+- Una sola pasada NumPy para todas las columnas (sin copiar un DataFrame por ticker).
+- NaN-aware: cada ticker usa solo sus propias barras (listados tardíos, huecos,
+  calendarios distintos); el warm-up arranca en su primera barra válida.
+- Resultado columnar: dict nombre -> matriz (T x N) alineada con el panel de entrada.
+
+Indicadores (nombres como los usa el resto de la app):
+    SMA{n}, EMA{n}, RSI{n}, BB{n} (-> BB{n}_upper/_mid/_lower),
+    MACD (-> MACD, MACD_signal, MACD_hist), ATR{n} (requiere high/low)
+"""
+
+DEFAULT_INDICATORS = ("SMA20", "SMA50", "EMA20", "RSI14")
+BOLLINGER_K = 2.0
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+
+_SPEC = re.compile(r"^(SMA|EMA|RSI|BB|ATR)(\d+)$|^MACD$")
+
+
+# ======================================================
+# NÚCLEOS (sobre matrices compactadas: sin NaN en el prefijo válido,
+# lo que cae en la cola se descarta al final)
+# ======================================================
+def _rolling_sum(x, window):
+    c = np.cumsum(x, axis=0)
+    out = np.full_like(x, np.nan)
+    if window <= len(x):
+        out[window - 1] = c[window - 1]
+        out[window:] = c[window:] - c[:-window]
+    return out
+
+
+def _sma(x, window):
+    return _rolling_sum(x, window) / window
+
+
+def _rolling_std(x, window):
+    # ddof=1 como pandas; rolling de pandas sobre la matriz entera (estable numéricamente,
+    # la resta de sumas acumuladas de cuadrados pierde precisión con splits y series largas)
+    if window < 2:
+        return np.full_like(x, np.nan)
+    return pd.DataFrame(x).rolling(window).std().to_numpy()
+
+
+def _ewm(x, alpha, adjust=False):
+    """
+    Media exponencial por columna (recursiva en el tiempo, vectorizada en tickers).
+    adjust=False: y_t = a*x_t + (1-a)*y_{t-1}, como pandas ewm(adjust=False).
+    adjust=True: pesos normalizados, como pandas ewm() por defecto.
+    """
+    out = np.empty_like(x)
+    if not len(x):
+        return out
+    beta = 1.0 - alpha
+    out[0] = x[0]
+    if adjust:
+        weight = 1.0
+        for t in range(1, len(x)):
+            # y_t = (x_t + b*w_{t-1}*y_{t-1}) / w_t, con w_t = 1 + b*w_{t-1}
+            prev_w = beta * weight
+            weight = 1.0 + prev_w
+            np.multiply(out[t - 1], prev_w / weight, out=out[t])
+            out[t] += x[t] / weight
+    else:
+        for t in range(1, len(x)):
+            np.multiply(out[t - 1], beta, out=out[t])
+            out[t] += alpha * x[t]
+    return out
+
+
+def _ema(x, span, adjust=False):
+    return _ewm(x, 2.0 / (span + 1.0), adjust)
+
+
+def _diff(x):
+    d = np.full_like(x, np.nan)
+    d[1:] = x[1:] - x[:-1]
+    return d
+
+
+def _rsi(x, period, method="sma"):
+    """
+    method="sma": medias simples de ganancias/pérdidas (igual que core.utils.rsi).
+    method="wilder": suavizado de Wilder (alpha = 1/period) sembrado con la media simple.
+    Sin pérdidas en la ventana -> NaN, como core.utils.rsi.
+    """
+    delta = _diff(x)
+    gain = np.clip(delta, 0, None)
+    loss = np.clip(-delta, 0, None)
+    if method == "wilder":
+        avg_gain = _wilder(gain, period)
+        avg_loss = _wilder(loss, period)
+    else:
+        g = np.nan_to_num(gain)
+        l = np.nan_to_num(loss)
+        avg_gain = _sma(g, period)
+        avg_loss = _sma(l, period)
+        # la primera ventana incluye el diff inexistente de la barra 0
+        avg_gain[:period] = np.nan
+        avg_loss[:period] = np.nan
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = avg_gain / np.where(avg_loss == 0, np.nan, avg_loss)
+    return 100.0 - 100.0 / (1.0 + rs)
+
+
+def _wilder(x, period):
+    """
+    Media de Wilder desde la fila 1 (x[0] es NaN por el diff):
+    semilla = media simple de las primeras `period` filas, luego y = y + (x - y) / period.
+    """
+    out = np.full_like(x, np.nan)
+    if period + 1 > len(x):
+        return out
+    prev = np.nanmean(x[1:period + 1], axis=0)
+    out[period] = prev
+    for t in range(period + 1, len(x)):
+        prev = prev + (x[t] - prev) / period
+        out[t] = prev
+    return out
+
+
+def _atr(high, low, close, period):
+    prev_close = np.full_like(close, np.nan)
+    prev_close[1:] = close[:-1]
+    tr = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    return _ewm(tr, 1.0 / period)
+
+
+# ======================================================
+# API
+# ======================================================
+def parse_indicators(indicators):
+    """
+    Valida la lista de indicadores y devuelve [(nombre, tipo, período), ...].
+    """
+    parsed = []
+    for name in indicators:
+        name = name.upper()
+        m = _SPEC.match(name)
+        if not m:
+            raise ValueError(f"Indicador desconocido: {name!r}")
+        kind = m.group(1) or "MACD"
+        period = int(m.group(2)) if m.group(2) else None
+        if period is not None and period < 1:
+            raise ValueError(f"Período inválido en {name!r}")
+        parsed.append((name, kind, period))
+    return parsed
+
+
+def compute_panel(close, indicators=DEFAULT_INDICATORS, high=None, low=None,
+                  rsi_method="sma", ema_adjust=False):
+    """
+    Calcula los indicadores para todas las columnas del panel de cierres.
+
+    close: DataFrame fecha x ticker (p. ej. benchmarks.synthetic_data.close_matrix)
+           o matriz (T x N). NaN = el ticker no cotiza ese día.
+    high/low: mismos ejes que close; solo hacen falta para ATR.
+
+    Devuelve dict con "dates", "tickers" y una matriz (T x N) float64 por salida
+    (NaN durante el warm-up y en los días sin cotización).
+    """
+    parsed = parse_indicators(indicators)
+    if any(kind == "ATR" for _, kind, _ in parsed) and (high is None or low is None):
+        raise ValueError("ATR requiere high y low")
+
+    if isinstance(close, pd.DataFrame):
+        dates, tickers = close.index, list(close.columns)
+    else:
+        dates, tickers = None, None
+    frame = close if isinstance(close, pd.DataFrame) else None
+    c = as_matrix(close)
+    if c.ndim == 1:
+        c = c[:, None]
+
+    valid = ~np.isnan(c)
+    cc, flat, counts = compact_panel(c, valid)
+    tail = tail_mask(cc.shape, counts)
+    needs_hl = any(kind == "ATR" for _, kind, _ in parsed)
+    if needs_hl:
+        hc = as_matrix(high, frame).reshape(c.shape).ravel()[flat].reshape(c.shape)
+        lc = as_matrix(low, frame).reshape(c.shape).ravel()[flat].reshape(c.shape)
+
+    outputs = {}
+    for name, kind, n in parsed:
+        if kind == "SMA":
+            outputs[name] = _sma(cc, n)
+        elif kind == "EMA":
+            outputs[name] = _ema(cc, n, ema_adjust)
+        elif kind == "RSI":
+            outputs[name] = _rsi(cc, n, rsi_method)
+        elif kind == "BB":
+            mid = _sma(cc, n)
+            width = BOLLINGER_K * _rolling_std(cc, n)
+            outputs[f"{name}_mid"] = mid
+            outputs[f"{name}_upper"] = mid + width
+            outputs[f"{name}_lower"] = mid - width
+        elif kind == "MACD":
+            macd = _ema(cc, MACD_FAST) - _ema(cc, MACD_SLOW)
+            signal = _ema(macd, MACD_SIGNAL)
+            outputs["MACD"] = macd
+            outputs["MACD_signal"] = signal
+            outputs["MACD_hist"] = macd - signal
+        elif kind == "ATR":
+            outputs[name] = _atr(hc, lc, cc, n)
+
+    result = {"dates": dates, "tickers": tickers}
+    for name, values in outputs.items():
+        values[tail] = np.nan
+        result[name] = expand_panel(values, flat)
+    return result
+
+
+def output_names(result):
+    return [k for k in result if k not in ("dates", "tickers")]
+
+
+def indicator_frame(result, ticker):
+    """
+    DataFrame fecha x indicador de un ticker (solo sus días con valores).
+    """
+    j = result["tickers"].index(ticker)
+    names = output_names(result)
+    df = pd.DataFrame({n: result[n][:, j] for n in names}, index=result["dates"])
+    return df.dropna(how="all")
+
+
+def latest_values(result):
+    """
+    Último valor válido de cada indicador por ticker (DataFrame ticker x indicador),
+    útil para rankings sobre muchos favoritos.
+    """
+    out = {}
+    for name in output_names(result):
+        m = result[name]
+        ok = ~np.isnan(m)
+        last = len(m) - 1 - np.argmax(ok[::-1], axis=0)
+        vals = m[last, np.arange(m.shape[1])]
+        out[name] = np.where(ok.any(axis=0), vals, np.nan)
+    return pd.DataFrame(out, index=result["tickers"])
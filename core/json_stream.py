@@ -0,0 +1,188 @@
+# core/json_stream.py
+import codecs
+import json
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+"""
+Decodificación JSON en streaming para respuestas grandes (históricos largos, noticias).
+En lugar de response.json() -> lista de dicts -> DataFrame (tres copias en memoria),
+se parsea el array elemento por elemento directo a columnas numpy preasignadas.
+El pico de memoria queda en: chunk actual + un elemento + columnas de salida.
+"""
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_WS = " \t\n\r"
+
+
+def iter_json_array(chunks, data_key="data"):
+    """
+    Itera los elementos de un array JSON de primer nivel a medida que llegan los chunks
+    (bytes o str). Si la respuesta es un objeto (ej. {"data": [...]}) se decodifica
+    completo y se itera su `data_key`.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    it = iter(chunks)
+    buf = ""
+    pos = 0
+    eof = False
+
+    def more():
+        nonlocal buf, pos, eof
+        try:
+            chunk = next(it)
+        except StopIteration:
+            eof = True
+            buf = buf[pos:] + utf8.decode(b"", final=True)
+            pos = 0
+            return
+        if isinstance(chunk, bytes):
+            chunk = utf8.decode(chunk)
+        # descartar lo ya consumido para no acumular el texto completo
+        buf = buf[pos:] + chunk
+        pos = 0
+
+    def skip(chars):
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in chars:
+                pos += 1
+            if pos < len(buf) or eof:
+                return
+            more()
+
+    # --- apertura ---
+    skip(_WS)
+    if pos >= len(buf):
+        return
+    if buf[pos] != "[":
+        # objeto u otro valor: no es streameable, se decodifica entero
+        while not eof:
+            more()
+        obj = json.loads(buf[pos:])
+        items = obj.get(data_key) if isinstance(obj, dict) else None
+        for item in items or []:
+            yield item
+        return
+    pos += 1
+
+    # --- elementos ---
+    while True:
+        skip(_WS + ",")
+        if pos >= len(buf):
+            return
+        if buf[pos] == "]":
+            return
+        try:
+            obj, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            more()
+            continue
+        # un escalar que termina justo en el borde del chunk puede estar cortado ("12" de "123")
+        if end >= len(buf) and not eof and not isinstance(obj, (dict, list)):
+            more()
+            continue
+        pos = end
+        yield obj
+
+
+class _ColumnBuffer:
+    """
+    Columnas numpy preasignadas que crecen x2 cuando se llenan.
+    """
+
+    def __init__(self, dtypes, capacity=256):
+        self.dtypes = dtypes
+        self.capacity = max(1, capacity)
+        self.n = 0
+        self.cols = {k: np.empty(self.capacity, dtype=dt) for k, dt in dtypes.items()}
+
+    def _grow(self):
+        self.capacity *= 2
+        for k, arr in self.cols.items():
+            new = np.empty(self.capacity, dtype=arr.dtype)
+            new[:self.n] = arr[:self.n]
+            self.cols[k] = new
+
+    def append(self, values):
+        if self.n >= self.capacity:
+            self._grow()
+        for k, v in values.items():
+            self.cols[k][self.n] = v
+        self.n += 1
+
+    def trimmed(self):
+        return {k: arr[:self.n] for k, arr in self.cols.items()}
+
+
+def _num(v, default=np.nan):
+    if v is None or v == "":
+        return default
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return default
+
+
+def decode_ohlc_stream(chunks, capacity=256):
+    """
+    Decodifica un array JSON de barras EODHD directo a un DataFrame OHLC tipado
+    (date datetime64, precios float64, volume int64), ordenado por fecha.
+    Las filas sin fecha válida se descartan.
+    """
+    buf = _ColumnBuffer({
+        "date": "datetime64[D]",
+        "open": "f8", "high": "f8", "low": "f8", "close": "f8",
+        "volume": "i8",
+    }, capacity=capacity)
+
+    for row in iter_json_array(chunks):
+        if not isinstance(row, dict):
+            continue
+        try:
+            d = np.datetime64(str(row.get("date", ""))[:10], "D")
+        except ValueError:
+            continue
+        buf.append({
+            "date": d,
+            "open": _num(row.get("open")),
+            "high": _num(row.get("high")),
+            "low": _num(row.get("low")),
+            "close": _num(row.get("close")),
+            "volume": int(_num(row.get("volume"), 0)),
+        })
+
+    cols = buf.trimmed()
+    if len(cols["date"]) > 1 and (np.diff(cols["date"].astype("i8")) < 0).any():
+        order = np.argsort(cols["date"], kind="stable")
+        cols = {k: v[order] for k, v in cols.items()}
+
+    df = pd.DataFrame({k: cols[k] for k in ("open", "high", "low", "close", "volume")})
+    df.insert(0, "date", pd.to_datetime(cols["date"]))
+    return df
+
+
+def decode_news_stream(chunks, limit=50):
+    """
+    Decodifica noticias en streaming y corta apenas se juntan `limit` items
+    (el resto de la respuesta no se parsea).
+    Devuelve lista de dicts con keys: title, content, published_at.
+    """
+    news = []
+    for it in iter_json_array(chunks):
+        if not isinstance(it, dict):
+            continue
+        news.append({
+            "title": it.get("title") or it.get("headline") or "",
+            "content": it.get("content") or it.get("description") or "",
+            "published_at": it.get("published_at") or it.get("date") or datetime.now().isoformat(),
+        })
+        if len(news) >= limit:
+            break
+    return news
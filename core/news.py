@@ -1,16 +1,18 @@
 # core/news.py
 
 import streamlit as st
-from core.eodhd_api import api_get
+from core.eodhd_api import eod_request
 from googletrans import Translator
+import textblob
 from textblob import TextBlob
+from core.score_cache import cached_scores
 
 translator = Translator()
 
 def fetch_news(ticker, limit=20):
     """
     Obtiene noticias desde EODHD para un ticker dado.
-    Usa el API existente en core/eodhd_api.py
+    Usa el wrapper eod_request de core/eodhd_api.py (None si la API falla).
     """
     endpoint = f"news"
     params = {
@@ -18,7 +20,7 @@ def fetch_news(ticker, limit=20):
         "limit": limit
     }
 
-    data = api_get(endpoint, params)
+    data = eod_request(endpoint, params)
 
     if not data or isinstance(data, dict) and "error" in data:
         return []
@@ -69,8 +71,11 @@ def sentiment_score(text):
     """ Devuelve sentimiento (+ = positivo, - = negativo) """
     if not text:
         return 0
-    blob = TextBlob(text)
-    return round(blob.sentiment.polarity, 3)
+    # cacheado por texto normalizado, aparte de los puntajes del modelo transformer
+    return cached_scores(
+        "textblob", textblob.__version__, [text],
+        lambda texts: [round(TextBlob(t).sentiment.polarity, 3) for t in texts],
+    )[0]
 
 
 def process_news(ticker, lang="EN"):
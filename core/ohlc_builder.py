@@ -0,0 +1,96 @@
+# core/ohlc_builder.py
+import logging
+
+import numpy as np
+import pandas as pd
+
+"""
+Constructor rápido y tipado de DataFrames OHLC a partir de la lista de dicts de EODHD.
+- Esquema explícito: date datetime64, precios float64 (o float32 opt-in), volume int64.
+- Fechas con formato ISO fijo (sin inferencia de formato).
+- No ordena si la serie ya viene ordenada.
+- Las filas malformadas se reportan y se descartan de a una (no se pierde toda la serie).
+"""
+
+logger = logging.getLogger(__name__)
+
+OHLC_COLUMNS = ["date", "open", "high", "low", "close", "volume"]
+PRICE_COLUMNS = ["open", "high", "low", "close"]
+DATE_FORMAT = "%Y-%m-%d"
+
+
+def empty_ohlc_frame(price_dtype="float64"):
+    return pd.DataFrame({
+        "date": pd.Series([], dtype="datetime64[ns]"),
+        **{c: pd.Series([], dtype=price_dtype) for c in PRICE_COLUMNS},
+        "volume": pd.Series([], dtype="int64"),
+    })
+
+
+def _numeric_column(values, dtype):
+    # camino rápido: lista homogénea de números (o strings numéricos)
+    try:
+        return np.array(values, dtype=dtype)
+    except (TypeError, ValueError):
+        return pd.to_numeric(pd.Series(values, dtype="object"), errors="coerce").to_numpy(dtype=dtype)
+
+
+def _date_column(values):
+    # camino rápido: todas "YYYY-MM-DD"
+    try:
+        return np.array(values, dtype="datetime64[D]").astype("datetime64[ns]")
+    except (TypeError, ValueError):
+        return pd.to_datetime(
+            pd.Series(values, dtype="object"), format=DATE_FORMAT, exact=False, errors="coerce"
+        ).to_numpy(dtype="datetime64[ns]")
+
+
+def build_ohlc_frame(rows, price_dtype="float64", return_errors=False):
+    """
+    Convierte una lista de dicts OHLC en un DataFrame con esquema fijo, ordenado por fecha.
+    Una fila es malformada si no es dict, su fecha no es ISO válida o su close no es numérico.
+    Con return_errors=True devuelve (df, errores) donde errores es [(índice, motivo), ...].
+    """
+    rows = rows if isinstance(rows, list) else list(rows or [])
+    errors = []
+
+    if not rows:
+        df = empty_ohlc_frame(price_dtype)
+        return (df, errors) if return_errors else df
+
+    is_dict = np.fromiter((isinstance(r, dict) for r in rows), dtype=bool, count=len(rows))
+    get = rows if is_dict.all() else [r if ok else {} for r, ok in zip(rows, is_dict)]
+
+    dates = _date_column([r.get("date") for r in get])
+    prices = {c: _numeric_column([r.get(c) for r in get], price_dtype) for c in PRICE_COLUMNS}
+    volume = _numeric_column([r.get("volume") for r in get], "float64")
+    volume = np.nan_to_num(volume, nan=0.0, posinf=0.0, neginf=0.0).astype("int64")
+
+    bad_date = np.isnat(dates)
+    bad_close = np.isnan(prices["close"])
+    valid = is_dict & ~bad_date & ~bad_close
+
+    if not valid.all():
+        for i in np.flatnonzero(~valid):
+            if not is_dict[i]:
+                reason = "fila no es un objeto"
+            elif bad_date[i]:
+                reason = f"fecha inválida: {get[i].get('date')!r}"
+            else:
+                reason = f"close no numérico: {get[i].get('close')!r}"
+            errors.append((int(i), reason))
+        logger.warning("build_ohlc_frame: %d filas malformadas descartadas de %d", len(errors), len(rows))
+
+        dates = dates[valid]
+        prices = {c: v[valid] for c, v in prices.items()}
+        volume = volume[valid]
+
+    # ordenar solo si hace falta
+    if len(dates) > 1 and (np.diff(dates.view("i8")) < 0).any():
+        order = np.argsort(dates, kind="stable")
+        dates = dates[order]
+        prices = {c: v[order] for c, v in prices.items()}
+        volume = volume[order]
+
+    df = pd.DataFrame({"date": dates, **prices, "volume": volume})
+    return (df, errors) if return_errors else df
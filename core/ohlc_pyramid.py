@@ -0,0 +1,307 @@
+# core/ohlc_pyramid.py
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from core import ohlc_store
+from core.cache_manager import cache_load, cache_save
+
+"""
+Pirámide multi-resolución de OHLCV: la serie base (diaria o intradiaria) más sus
+agregados semanales y mensuales (y de 1h/4h si la base es intradiaria).
+- Agregación lineal con np.*.reduceat sobre barras ya ordenadas (sin groupby).
+- Actualización incremental: con barras nuevas solo se rehacen los baldes de la cola.
+- El gráfico elige el nivel más grueso que todavía tenga suficientes puntos en el rango.
+- Para tickers del store local, los niveles se guardan en data/ohlc_store/pyramid/.
+
+Cada barra agregada queda fechada en la primera barra real de su balde.
+"""
+
+DAILY_LEVELS = ("1D", "1W", "1M")
+INTRADAY_LEVELS = ("raw", "1h", "4h", "1D", "1W", "1M")
+# puntos mínimos que tiene que tener el nivel elegido dentro del rango pedido
+CHART_MIN_POINTS = 100
+
+PYRAMID_DIR = "pyramid"
+STORED_LEVELS = ("1W", "1M")
+
+_lock = threading.Lock()
+
+
+# ======================================================
+# AGREGACIÓN
+# ======================================================
+def _bucket_codes(dates, level):
+    """
+    Código entero del balde de cada fecha (datetime64). Semanas de lunes a domingo.
+    """
+    if level == "1h":
+        return dates.astype("datetime64[h]").view("i8")
+    if level == "4h":
+        return dates.astype("datetime64[h]").view("i8") // 4
+    if level == "1D":
+        return dates.astype("datetime64[D]").view("i8")
+    if level == "1W":
+        # 1970-01-01 fue jueves: +3 alinea los baldes al lunes
+        return (dates.astype("datetime64[D]").view("i8") + 3) // 7
+    if level == "1M":
+        return dates.astype("datetime64[M]").view("i8")
+    raise ValueError(f"Nivel desconocido: {level!r}")
+
+
+def is_intraday(df):
+    if df is None or df.empty:
+        return False
+    d = pd.to_datetime(df["date"]).to_numpy()
+    return bool((d != d.astype("datetime64[D]")).any())
+
+
+def resample_ohlc(df, level):
+    """
+    Agrega un DataFrame OHLCV (ordenado por fecha) al nivel pedido.
+    Columnas extra numéricas (SMA20, EMA20...) toman el último valor del balde.
+    """
+    if df is None or df.empty or level == "raw":
+        return df
+    dates = pd.to_datetime(df["date"]).to_numpy()
+    codes = _bucket_codes(dates, level)
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    ends = np.r_[starts[1:], len(codes)] - 1
+    if len(starts) == len(codes):
+        return df.reset_index(drop=True)
+
+    out = {"date": dates[starts]}
+    for col in df.columns:
+        if col == "date":
+            continue
+        values = df[col].to_numpy()
+        if col == "open":
+            out[col] = values[starts]
+        elif col == "high":
+            out[col] = np.fmax.reduceat(values, starts)
+        elif col == "low":
+            out[col] = np.fmin.reduceat(values, starts)
+        elif col == "volume":
+            out[col] = np.add.reduceat(values, starts)
+        elif values.dtype.kind in "fiu":
+            out[col] = values[ends]
+    return pd.DataFrame(out)
+
+
+def build_pyramid(df, levels=None):
+    """
+    Devuelve {nivel: DataFrame} de más fino a más grueso.
+    Con datos diarios: 1D/1W/1M; intradiarios: raw/1h/4h/1D/1W/1M.
+    """
+    if df is None or df.empty:
+        return {}
+    levels = levels or (INTRADAY_LEVELS if is_intraday(df) else DAILY_LEVELS)
+    base = df if df["date"].is_monotonic_increasing else df.sort_values("date")
+    base = base.reset_index(drop=True)
+    # el primer nivel es la serie tal cual llega (diaria o intradiaria)
+    pyramid = {levels[0]: base}
+    for level in levels[1:]:
+        pyramid[level] = resample_ohlc(base, level)
+    return pyramid
+
+
+def update_pyramid(pyramid, new_rows):
+    """
+    Agrega barras nuevas a la base y rehace solo los baldes afectados de cada nivel.
+    Devuelve la pirámide actualizada (los DataFrames se reemplazan, no se mutan).
+    """
+    if new_rows is None or len(new_rows) == 0:
+        return pyramid
+    new = new_rows if isinstance(new_rows, pd.DataFrame) else pd.DataFrame(list(new_rows))
+    new = new.assign(date=pd.to_datetime(new["date"])).sort_values("date")
+    if not pyramid:
+        return build_pyramid(new.reset_index(drop=True))
+
+    levels = list(pyramid)
+    base_level = levels[0]
+    base = pyramid[base_level]
+    if not base.empty:
+        new = new[new["date"] > base["date"].iloc[-1]]
+        if new.empty:
+            return pyramid
+    base = pd.concat([base, new[base.columns.intersection(new.columns)]], ignore_index=True)
+
+    out = {base_level: base}
+    first_new = new["date"].to_numpy()[:1]
+    base_dates = base["date"].to_numpy()
+    for level in levels[1:]:
+        agg = pyramid[level]
+        code = _bucket_codes(first_new, level)[0]
+        # barras base del primer balde tocado en adelante
+        lo = int(np.searchsorted(_bucket_codes(base_dates, level), code, side="left"))
+        keep = agg[_bucket_codes(agg["date"].to_numpy(), level) < code]
+        out[level] = pd.concat([keep, resample_ohlc(base.iloc[lo:], level)], ignore_index=True)
+    return out
+
+
+# ======================================================
+# SELECCIÓN DE NIVEL PARA GRÁFICOS
+# ======================================================
+def _count_in_range(df, start, end):
+    dates = df["date"].to_numpy()
+    lo = 0 if start is None else int(np.searchsorted(dates, np.datetime64(pd.Timestamp(start)), side="left"))
+    hi = len(dates) if end is None else int(
+        np.searchsorted(dates, np.datetime64(pd.Timestamp(end) + pd.Timedelta(days=1)), side="left"))
+    return lo, hi
+
+
+def select_level(pyramid, start=None, end=None, min_points=CHART_MIN_POINTS):
+    """
+    Nivel más grueso con al menos min_points barras en [start, end]
+    (si ninguno llega, el más fino).
+    """
+    if not pyramid:
+        return None
+    levels = list(pyramid)
+    for level in reversed(levels):
+        lo, hi = _count_in_range(pyramid[level], start, end)
+        if hi - lo >= min_points:
+            return level
+    return levels[0]
+
+
+def range_level(start, end, min_points=CHART_MIN_POINTS, crypto=False, levels=DAILY_LEVELS):
+    """
+    Nivel que elegiría select_level para [start, end] sobre una serie diaria completa,
+    calculado solo con el calendario (días hábiles, o todos si es cripto), sin datos.
+    Permite armar la clave de cache de un gráfico antes de cargar o agregar barras.
+    """
+    days = np.arange(np.datetime64(pd.Timestamp(start).date(), "D"),
+                     np.datetime64(pd.Timestamp(end).date(), "D") + 1)
+    if not crypto:
+        days = days[np.is_busday(days)]
+    for level in reversed(levels):
+        if len(np.unique(_bucket_codes(days, level))) >= min_points:
+            return level
+    return levels[0]
+
+
+def pyramid_slice(pyramid, start=None, end=None, min_points=CHART_MIN_POINTS, level=None):
+    """
+    (DataFrame del nivel elegido recortado a [start, end], nivel).
+    Con level se usa ese nivel (si existe) en lugar de elegirlo por cantidad de puntos.
+    """
+    if level not in pyramid:
+        level = select_level(pyramid, start, end, min_points)
+    if level is None:
+        return pd.DataFrame(), None
+    df = pyramid[level]
+    lo, hi = _count_in_range(df, start, end)
+    return df.iloc[lo:hi].reset_index(drop=True), level
+
+
+def chart_frame(df, start=None, end=None, min_points=CHART_MIN_POINTS, level=None):
+    """
+    Atajo para la capa de gráficos: DataFrame OHLCV (cualquier resolución) ->
+    (barras del nivel más grueso que alcanza min_points en el rango, nivel).
+    Con level (ej. de range_level) solo se agrega ese nivel.
+    """
+    if level is not None and df is not None and not df.empty:
+        levels = INTRADAY_LEVELS if is_intraday(df) else DAILY_LEVELS
+        if level in levels:
+            base = df if df["date"].is_monotonic_increasing else df.sort_values("date")
+            base = base.reset_index(drop=True)
+            frame = base if level == levels[0] else resample_ohlc(base, level)
+            return pyramid_slice({level: frame}, start, end, min_points, level=level)
+    return pyramid_slice(build_pyramid(df), start, end, min_points)
+
+
+# ======================================================
+# NIVELES GUARDADOS JUNTO AL STORE DE OHLC
+# ======================================================
+def _level_path(ticker, level):
+    return os.path.join(ohlc_store.STORE_DIR, PYRAMID_DIR, f"{ohlc_store._safe_name(ticker)}_{level}.npy")
+
+
+def _meta_path(ticker):
+    return os.path.join(ohlc_store.STORE_DIR, PYRAMID_DIR, f"{ohlc_store._safe_name(ticker)}.json")
+
+
+def _save_level(ticker, level, df):
+    path = _level_path(ticker, level)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        np.save(f, ohlc_store._to_records(df), allow_pickle=False)
+    os.replace(tmp, path)
+
+
+def _load_level(ticker, level):
+    path = _level_path(ticker, level)
+    if not os.path.exists(path):
+        return None
+    try:
+        return ohlc_store._to_df(np.load(path, allow_pickle=False))
+    except Exception:
+        return None
+
+
+def update_store_pyramid(ticker):
+    """
+    Lleva los niveles semanal/mensual guardados hasta la última barra del store.
+    Solo rehace los baldes de la cola; si la historia cambió por detrás, reconstruye.
+    Devuelve la cantidad de barras diarias nuevas procesadas.
+    """
+    arr = ohlc_store._load_array(ticker)
+    if arr is None or len(arr) == 0:
+        return 0
+
+    with _lock:
+        meta = cache_load(_meta_path(ticker), {}) or {}
+        levels = {lv: _load_level(ticker, lv) for lv in STORED_LEVELS}
+        dates = arr["date"]
+        consumed = 0
+        if meta.get("last_date") and all(v is not None for v in levels.values()):
+            last = np.datetime64(meta["last_date"], "D")
+            consumed = int(np.searchsorted(dates, last, side="right"))
+            if consumed != meta.get("rows") or dates[consumed - 1] != last:
+                consumed = 0
+
+        if consumed and consumed == len(arr):
+            return 0
+
+        if consumed:
+            # la base incremental arranca en el primer balde tocado de cualquier nivel
+            # (una semana puede empezar en el mes anterior)
+            all_dates = dates.astype("datetime64[ns]")
+            first_new = all_dates[consumed:consumed + 1]
+            lo = min(
+                int(np.searchsorted(_bucket_codes(all_dates, lv), _bucket_codes(first_new, lv)[0]))
+                for lv in STORED_LEVELS
+            )
+            pyramid = {"1D": ohlc_store._to_df(np.array(arr[lo:consumed]))}
+            pyramid.update(levels)
+            pyramid = update_pyramid(pyramid, ohlc_store._to_df(np.array(arr[consumed:])))
+        else:
+            pyramid = build_pyramid(ohlc_store._to_df(np.array(arr)))
+
+        for lv in STORED_LEVELS:
+            _save_level(ticker, lv, pyramid[lv])
+        cache_save(_meta_path(ticker), {"last_date": str(dates[-1]), "rows": int(len(arr))})
+    return int(len(arr) - consumed)
+
+
+def load_store_pyramid(ticker, from_date=None, to_date=None):
+    """
+    Pirámide de un ticker del store: 1D desde ohlc_store.load_ohlc y 1W/1M de los
+    niveles guardados (se actualizan si hace falta). {} si no hay datos locales.
+    """
+    daily = ohlc_store.load_ohlc(ticker, from_date, to_date)
+    if daily.empty:
+        return {}
+    update_store_pyramid(ticker)
+    pyramid = {"1D": daily}
+    for lv in STORED_LEVELS:
+        df = _load_level(ticker, lv)
+        if df is None:
+            return build_pyramid(daily)
+        lo, hi = _count_in_range(df, from_date, to_date)
+        pyramid[lv] = df.iloc[lo:hi].reset_index(drop=True)
+    return pyramid
@@ -0,0 +1,307 @@
+# core/ohlc_store.py
+import os
+import re
+import threading
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from core.cache_manager import cache_load, cache_save
+from core.ohlc_builder import build_ohlc_frame
+
+"""
+Almacén local incremental de OHLC diario (un archivo .npy por ticker).
+- Cada ticker se guarda como array estructurado (date, open, high, low, close, volume).
+- Se lee con memory-map, así un slice from/to no carga toda la serie.
+- Un .json al lado registra la última fecha guardada, el último sync, desde qué fecha
+  ya se consultó la API (para no volver a pedir rangos cubiertos) y una revisión que
+  sube cuando un merge toca barras ya guardadas (los derivados incrementales la comparan).
+- Las escrituras son atómicas (archivo temporal + os.replace).
+"""
+
+STORE_DIR = os.path.join("data", "ohlc_store")
+
+OHLC_DTYPE = np.dtype([
+    ("date", "datetime64[D]"),
+    ("open", "f8"),
+    ("high", "f8"),
+    ("low", "f8"),
+    ("close", "f8"),
+    ("volume", "i8"),
+])
+
+_write_lock = threading.Lock()
+
+
+# -----------------------------
+# RUTAS / META
+# -----------------------------
+def _safe_name(ticker):
+    return re.sub(r"[^A-Za-z0-9._-]", "_", ticker.upper())
+
+
+def _array_path(ticker):
+    return os.path.join(STORE_DIR, f"{_safe_name(ticker)}.npy")
+
+
+def _meta_path(ticker):
+    return os.path.join(STORE_DIR, f"{_safe_name(ticker)}.json")
+
+
+def load_meta(ticker):
+    return cache_load(_meta_path(ticker), {}) or {}
+
+
+def store_revision(ticker):
+    """
+    Versión barata de los datos guardados (sin leer el array): cambia con cada
+    append o merge. Sirve como parte de claves de cache de derivados (gráficos).
+    """
+    meta = load_meta(ticker)
+    return (meta.get("last_date"), meta.get("rows"), meta.get("revision", 0))
+
+
+def last_date(ticker):
+    """
+    Última fecha guardada para el ticker (date) o None si no hay datos.
+    """
+    meta = load_meta(ticker)
+    if meta.get("last_date"):
+        try:
+            return date.fromisoformat(meta["last_date"])
+        except ValueError:
+            pass
+    arr = _load_array(ticker)
+    if arr is None or len(arr) == 0:
+        return None
+    return arr["date"][-1].astype(object)
+
+
+# -----------------------------
+# CONVERSIONES
+# -----------------------------
+def _to_records(rows):
+    """
+    Convierte lista de dicts (formato EODHD) o DataFrame OHLC al array estructurado,
+    ordenado por fecha y sin fechas duplicadas.
+    """
+    df = rows if isinstance(rows, pd.DataFrame) else build_ohlc_frame(rows)
+    if df.empty or "date" not in df.columns:
+        return np.empty(0, dtype=OHLC_DTYPE)
+
+    out = np.empty(len(df), dtype=OHLC_DTYPE)
+    out["date"] = pd.to_datetime(df["date"], errors="coerce").values.astype("datetime64[D]")
+    for col in ("open", "high", "low", "close"):
+        values = df[col] if col in df.columns else pd.Series(np.nan, index=df.index)
+        out[col] = pd.to_numeric(values, errors="coerce")
+    vol = df["volume"] if "volume" in df.columns else pd.Series(0, index=df.index)
+    out["volume"] = pd.to_numeric(vol, errors="coerce").fillna(0).astype("int64")
+
+    out = out[~np.isnat(out["date"])]
+    out = np.sort(out, order="date")
+    # quedarse con la última aparición de cada fecha
+    keep = np.ones(len(out), dtype=bool)
+    if len(out) > 1:
+        keep[:-1] = out["date"][1:] != out["date"][:-1]
+    return out[keep]
+
+
+def _to_df(arr):
+    return pd.DataFrame({
+        "date": pd.to_datetime(arr["date"]),
+        "open": arr["open"],
+        "high": arr["high"],
+        "low": arr["low"],
+        "close": arr["close"],
+        "volume": arr["volume"],
+    })
+
+
+# -----------------------------
+# LECTURA / ESCRITURA
+# -----------------------------
+def _load_array(ticker, mmap=True):
+    path = _array_path(ticker)
+    if not os.path.exists(path):
+        return None
+    try:
+        return np.load(path, mmap_mode="r" if mmap else None, allow_pickle=False)
+    except Exception:
+        return None
+
+
+def _atomic_save(ticker, arr):
+    os.makedirs(STORE_DIR, exist_ok=True)
+    path = _array_path(ticker)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        np.save(f, arr, allow_pickle=False)
+    os.replace(tmp, path)
+
+
+def append_ohlc(ticker, rows):
+    """
+    Agrega barras nuevas al final del store (solo fechas posteriores a la última guardada).
+    Devuelve la cantidad de barras agregadas.
+    """
+    new = _to_records(rows)
+
+    with _write_lock:
+        current = _load_array(ticker, mmap=False)
+        if current is not None and len(current):
+            new = new[new["date"] > current["date"][-1]]
+            if len(new) == 0:
+                return 0
+            merged = np.concatenate([current, new])
+        else:
+            merged = new
+            if len(merged) == 0:
+                return 0
+
+        _atomic_save(ticker, merged)
+        meta = load_meta(ticker)
+        meta["last_date"] = str(merged["date"][-1])
+        meta["rows"] = int(len(merged))
+        cache_save(_meta_path(ticker), meta)
+
+    return int(len(new))
+
+
+def merge_ohlc(ticker, rows, covered_from=None, full_history=False):
+    """
+    Fusiona barras en cualquier posición (p. ej. backfill de historia vieja).
+    Las fechas repetidas se quedan con la barra nueva.
+    covered_from / full_history registran hasta dónde hacia atrás ya se consultó la API.
+    Devuelve la cantidad de barras nuevas.
+    """
+    new = _to_records(rows)
+
+    with _write_lock:
+        current = _load_array(ticker, mmap=False)
+        before = 0 if current is None else len(current)
+        # toca barras ya guardadas (no es solo agregar al final): sube la revisión
+        rewrites = bool(before and len(new) and new["date"].min() <= current["date"][-1])
+        if current is not None and len(current):
+            current = current[~np.isin(current["date"], new["date"])]
+            merged = np.sort(np.concatenate([current, new]), order="date")
+        else:
+            merged = new
+
+        meta = load_meta(ticker)
+        if len(merged):
+            _atomic_save(ticker, merged)
+            meta["last_date"] = str(merged["date"][-1])
+            meta["rows"] = int(len(merged))
+        if rewrites:
+            meta["revision"] = meta.get("revision", 0) + 1
+        if full_history:
+            meta["full_history"] = True
+        if covered_from is not None:
+            prev = meta.get("covered_from")
+            cf = str(covered_from)
+            meta["covered_from"] = min(prev, cf) if prev else cf
+        cache_save(_meta_path(ticker), meta)
+
+    return max(0, int(len(merged)) - before)
+
+
+def _covers_from(meta, from_date):
+    if meta.get("full_history"):
+        return True
+    if from_date is None:
+        return False
+    cf = meta.get("covered_from")
+    return bool(cf) and str(pd.Timestamp(from_date).date()) >= cf
+
+
+def ensure_range(ticker, from_date, to_date, fetch_fn, today=None):
+    """
+    Garantiza que el store cubra [from_date, to_date] pidiendo a la API solo lo que falta:
+    - store vacío: solo el rango pedido (ventana corta = descarga corta)
+    - historia más vieja que la cubierta: backfill de la cabeza
+    - cola: sync_ohlc (una vez por día)
+    """
+    today = today or date.today()
+    meta = load_meta(ticker)
+    first = None
+    arr = _load_array(ticker)
+    if arr is not None and len(arr):
+        first = arr["date"][0].astype(object)
+
+    if first is None and not meta.get("covered_from"):
+        start = pd.Timestamp(from_date).date() if from_date is not None else None
+        rows = fetch_fn(ticker, start, today)
+        if rows is None:
+            return 0
+        added = merge_ohlc(ticker, rows, covered_from=start, full_history=start is None)
+        meta = load_meta(ticker)
+        meta["synced_at"] = today.isoformat()
+        cache_save(_meta_path(ticker), meta)
+        return added
+
+    added = 0
+    if not _covers_from(meta, from_date):
+        start = pd.Timestamp(from_date).date() if from_date is not None else None
+        end = (first - timedelta(days=1)) if first is not None else today
+        if start is None or start <= end:
+            rows = fetch_fn(ticker, start, end)
+            if rows is not None:
+                added += merge_ohlc(ticker, rows, covered_from=start, full_history=start is None)
+
+    if to_date is None or pd.Timestamp(to_date).date() > (last_date(ticker) or date.min):
+        added += sync_ohlc(ticker, fetch_fn, today=today)
+    return added
+
+
+def load_ohlc(ticker, from_date=None, to_date=None):
+    """
+    Devuelve el slice [from_date, to_date] del store como DataFrame OHLC.
+    Si no hay datos locales devuelve DataFrame vacío.
+    """
+    arr = _load_array(ticker)
+    if arr is None or len(arr) == 0:
+        return pd.DataFrame()
+
+    dates = arr["date"]
+    lo, hi = 0, len(arr)
+    if from_date is not None:
+        lo = int(np.searchsorted(dates, np.datetime64(pd.Timestamp(from_date).date(), "D"), side="left"))
+    if to_date is not None:
+        hi = int(np.searchsorted(dates, np.datetime64(pd.Timestamp(to_date).date(), "D"), side="right"))
+
+    # copiar el slice para soltar el memory-map
+    return _to_df(np.array(arr[lo:hi]))
+
+
+# -----------------------------
+# SINCRONIZACIÓN CON EODHD
+# -----------------------------
+def sync_ohlc(ticker, fetch_fn, today=None):
+    """
+    Trae de la API solo la cola faltante (from = last_date + 1) y la agrega al store.
+    fetch_fn(ticker, from_date, to_date) debe devolver lista de dicts o DataFrame OHLC.
+    Se sincroniza como máximo una vez por día.
+    """
+    today = today or date.today()
+    meta = load_meta(ticker)
+    if meta.get("synced_at") == today.isoformat():
+        return 0
+
+    last = last_date(ticker)
+    if last is not None and last >= today:
+        return 0
+
+    start = last + timedelta(days=1) if last is not None else None
+    rows = fetch_fn(ticker, start, today)
+    if rows is None:
+        # error de red / API: no marcar como sincronizado
+        return 0
+
+    added = append_ohlc(ticker, rows) if len(rows) else 0
+
+    meta = load_meta(ticker)
+    meta["synced_at"] = today.isoformat()
+    meta["synced_ts"] = datetime.now().isoformat()
+    cache_save(_meta_path(ticker), meta)
+    return added
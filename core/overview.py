@@ -1,8 +1,8 @@
 import numpy as np
 from datetime import datetime, timedelta
-from core.fundamentals import fetch_fundamentals
+from core.fundamentals import fetch_fundamentals, fetch_fundamentals_many
 from core.data_fetch import fetch_ohlc, fetch_news
-from core.sentiment import sentiment_score
+from core.sentiment import sentiment_scores
 
 def summarize_text_local(paragraph, max_sentences=3, lang="es"):
     """Mini resumen local sin modelos externos, con idioma."""
@@ -35,14 +35,16 @@ def compute_price_trend(df):
     return round(change_pct, 2)
 
 def compute_sentiment_overview(ticker):
-    news = fetch_news(ticker)
+    return sentiment_overview_from_news(fetch_news(ticker))
+
+def sentiment_overview_from_news(news):
+    """Promedio y etiqueta de sentimiento para noticias ya descargadas."""
     if not news:
         return None
 
-    scores = []
-    for item in news[:15]:
-        text = f"{item.get('title','')} {item.get('content','')}"
-        scores.append(sentiment_score(text))
+    # un solo llamado al modelo para todos los titulares (lotes internos)
+    texts = [f"{item.get('title','')} {item.get('content','')}" for item in news[:15]]
+    scores = sentiment_scores(texts)
 
     if not scores:
         return None
@@ -65,8 +67,10 @@ def competitors_stats(competitors):
     import numpy as np
     metrics = []
 
-    for comp in competitors[:8]:
-        f, _ = fetch_fundamentals(comp)
+    peers = competitors[:8]
+    results, _ = fetch_fundamentals_many(peers)
+    for comp in peers:
+        f, _ = results.get(comp, ({}, []))
         if f and f.get("PERatio"):
             metrics.append(f["PERatio"])
 
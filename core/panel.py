@@ -0,0 +1,49 @@
+# core/panel.py
+import numpy as np
+import pandas as pd
+
+"""
+Utilidades compartidas para paneles fecha x ticker (matrices T x N con NaN donde
+un ticker no cotiza). Las usan core.indicators y core.risk_metrics.
+- compact_panel sube las barras válidas de cada columna al principio, así los
+  núcleos trabajan sobre prefijos sin huecos; expand_panel deshace el movimiento.
+"""
+
+
+def as_matrix(panel, like=None):
+    """
+    DataFrame / array -> matriz float64. Con like, el DataFrame se reindexa a sus
+    fechas y columnas.
+    """
+    if panel is None:
+        return None
+    if isinstance(panel, pd.DataFrame):
+        if like is not None:
+            panel = panel.reindex(index=like.index, columns=like.columns)
+        return panel.to_numpy(dtype="float64")
+    return np.asarray(panel, dtype="float64")
+
+
+def compact_panel(values, valid):
+    """
+    Sube las barras válidas de cada columna al principio (orden estable).
+    Devuelve (compactada, índice plano para volver atrás, cantidad de válidas por columna).
+    """
+    n_cols = values.shape[1]
+    order = np.argsort(~valid, axis=0, kind="stable")
+    flat = (order * n_cols + np.arange(n_cols)).ravel()
+    compact = values.ravel()[flat].reshape(values.shape)
+    counts = valid.sum(axis=0)
+    return compact, flat, counts
+
+
+def expand_panel(compact, flat):
+    """Inversa de compact_panel: devuelve cada valor a su fecha original."""
+    out = np.empty_like(compact)
+    out.ravel()[flat] = compact.ravel()
+    return out
+
+
+def tail_mask(shape, counts):
+    """True en las filas compactadas que no corresponden a barras reales."""
+    return np.arange(shape[0])[:, None] >= counts[None, :]
@@ -1 +1,242 @@
-# Placeholder: future rate limiting
+# core/rate_limiter.py
+import json
+import os
+import threading
+import time
+from datetime import date
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    try:
+        import msvcrt
+    except ImportError:
+        msvcrt = None
+
+from core.config import EODHD_RATE_PER_MINUTE, EODHD_DAILY_QUOTA, RATE_LIMIT_MAX_WAIT
+
+"""
+Token bucket compartido entre threads y procesos del mismo host.
+- El estado global (tokens, cuota diaria usada) vive en un JSON protegido con file-lock.
+- Cada proceso no toca el disco en cada llamada: toma del bucket global un lote de
+  tokens (LEASE_FRACTION de la capacidad) y lo gasta en memoria. Cuando el lote se
+  acaba o vence (LEASE_TTL), devuelve el sobrante y pide otro en una sola
+  sincronización con file-lock. Lo que un proceso tiene en su lote ya está descontado
+  del bucket global, así entre todos nunca superan el límite.
+- Cada endpoint tiene un costo (fundamentals cuesta más que eod, igual que en EODHD).
+- Si no hay tokens, la llamada espera (en cola) hasta que se liberen; si la espera
+  estimada supera max_wait (RATE_LIMIT_MAX_WAIT por defecto) se rechaza enseguida.
+"""
+
+STATE_PATH = os.path.join("data", "rate_limiter.json")
+LOCK_PATH = STATE_PATH + ".lock"
+
+# 💰 Costo en "API calls" de EODHD por familia de endpoint
+ENDPOINT_COSTS = {
+    "eod": 1,
+    "historical-prices": 1,
+    "real-time": 1,
+    "fundamentals": 10,
+    "financials": 10,
+    "news": 5,
+    "screener": 5,
+    "screening": 5,
+    "eod-bulk-last-day": 100,
+}
+DEFAULT_COST = 1
+
+# fracción de la capacidad que un proceso toma por sincronización, y cuánto vale el lote
+LEASE_FRACTION = 0.05
+LEASE_TTL = 1.0  # segundos
+
+_thread_lock = threading.Lock()
+# lote de tokens de este proceso (ya descontado del bucket global)
+_lease = {"tokens": 0.0, "expires": 0.0, "day": None}
+_stats = {"acquired": 0, "waited": 0, "wait_seconds": 0.0, "rejected": 0, "syncs": 0}
+
+
+# -----------------------------
+# FILE LOCK
+# -----------------------------
+class _FileLock:
+    def __init__(self, path):
+        self.path = path
+        self.f = None
+
+    def __enter__(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.f = open(self.path, "a+")
+        if fcntl is not None:
+            fcntl.flock(self.f.fileno(), fcntl.LOCK_EX)
+        elif msvcrt is not None:
+            self.f.seek(0)
+            msvcrt.locking(self.f.fileno(), msvcrt.LK_LOCK, 1)
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self.f.fileno(), fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                self.f.seek(0)
+                msvcrt.locking(self.f.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self.f.close()
+        return False
+
+
+# -----------------------------
+# ESTADO
+# -----------------------------
+def _capacity():
+    return float(EODHD_RATE_PER_MINUTE)
+
+
+def _refill_rate():
+    # tokens por segundo
+    return EODHD_RATE_PER_MINUTE / 60.0
+
+
+def _read_state():
+    try:
+        with open(STATE_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def _write_state(state):
+    tmp = f"{STATE_PATH}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp, STATE_PATH)
+
+
+def _refresh(state, now):
+    today = date.today().isoformat()
+    if state.get("day") != today:
+        state["day"] = today
+        state["used_today"] = 0
+
+    tokens = state.get("tokens")
+    updated = state.get("updated", now)
+    if tokens is None:
+        tokens = _capacity()
+    tokens = min(_capacity(), tokens + max(0.0, now - updated) * _refill_rate())
+    state["tokens"] = tokens
+    state["updated"] = now
+    return state
+
+
+def endpoint_cost(endpoint):
+    """
+    Costo del endpoint según su familia ("fundamentals/MSFT.US" -> fundamentals).
+    """
+    family = (endpoint or "").split("?")[0].split("/")[0]
+    return ENDPOINT_COSTS.get(family, DEFAULT_COST)
+
+
+def _return_lease(state):
+    """
+    Devuelve al bucket global lo que quedó sin usar del lote local (bajo file-lock).
+    """
+    left = _lease["tokens"]
+    if left > 0 and _lease["day"] == state["day"]:
+        state["tokens"] = min(_capacity(), state["tokens"] + left)
+        state["used_today"] = max(0, state["used_today"] - left)
+    _lease["tokens"] = 0.0
+
+
+def _sync(cost):
+    """
+    Sincronización con el bucket global: devuelve el sobrante y pide un lote nuevo.
+    Devuelve ("ok", 0), ("quota", 0) o ("wait", segundos estimados).
+    """
+    with _FileLock(LOCK_PATH):
+        state = _refresh(_read_state(), time.time())
+        _return_lease(state)
+        _stats["syncs"] += 1
+
+        quota_left = EODHD_DAILY_QUOTA - state["used_today"]
+        if quota_left < cost:
+            _write_state(state)
+            return "quota", 0.0
+
+        grant = min(max(cost, _capacity() * LEASE_FRACTION), state["tokens"], quota_left)
+        if grant >= cost:
+            state["tokens"] -= grant
+            state["used_today"] += grant
+            _write_state(state)
+            _lease.update(tokens=grant, expires=time.monotonic() + LEASE_TTL, day=state["day"])
+            return "ok", 0.0
+
+        _write_state(state)
+        return "wait", (cost - state["tokens"]) / _refill_rate()
+
+
+# -----------------------------
+# API PÚBLICA
+# -----------------------------
+def acquire(endpoint, max_wait=RATE_LIMIT_MAX_WAIT):
+    """
+    Consume tokens para el endpoint. Si no alcanzan, espera hasta que se repongan.
+    Devuelve True si se pudo adquirir, False si se agotó la cuota diaria
+    o la espera superaría max_wait segundos.
+    """
+    cost = min(float(endpoint_cost(endpoint)), _capacity())
+    deadline = time.monotonic() + max_wait
+    waited = 0.0
+
+    while True:
+        with _thread_lock:
+            # camino rápido: el lote local alcanza, sin disco
+            if _lease["tokens"] < cost or time.monotonic() >= _lease["expires"]:
+                status, wait = _sync(cost)
+                if status == "quota":
+                    _stats["rejected"] += 1
+                    return False
+            else:
+                status, wait = "ok", 0.0
+
+            if status == "ok":
+                _lease["tokens"] -= cost
+                _stats["acquired"] += 1
+                if waited:
+                    _stats["waited"] += 1
+                    _stats["wait_seconds"] += waited
+                return True
+
+        remaining = deadline - time.monotonic()
+        if wait > remaining:
+            _stats["rejected"] += 1
+            return False
+        sleep_for = min(wait, LEASE_TTL)
+        time.sleep(sleep_for)
+        waited += sleep_for
+
+
+def remaining_quota():
+    """
+    Cuota diaria restante y tokens disponibles en este momento
+    (el sobrante del lote local cuenta como disponible).
+    """
+    with _thread_lock, _FileLock(LOCK_PATH):
+        state = _refresh(_read_state(), time.time())
+        left = _lease["tokens"] if _lease["day"] == state["day"] else 0.0
+    used = round(max(0, state["used_today"] - left), 2)
+    return {
+        "daily_quota": EODHD_DAILY_QUOTA,
+        "used_today": used,
+        "remaining_today": max(0, EODHD_DAILY_QUOTA - used),
+        "tokens": round(min(_capacity(), state["tokens"] + left), 2),
+    }
+
+
+def limiter_stats():
+    """
+    Contadores de este proceso (adquisiciones, esperas, rechazos).
+    """
+    stats = dict(_stats)
+    stats["wait_seconds"] = round(stats["wait_seconds"], 3)
+    return stats
@@ -0,0 +1,219 @@
+# core/risk_metrics.py
+import numpy as np
+import pandas as pd
+
+from core.panel import as_matrix, compact_panel, expand_panel, tail_mask
+
+"""
+Métricas de riesgo para un panel fecha x ticker en una sola pasada de retornos.
+- Ventanas móviles (por defecto 20/60/252 barras) y período completo.
+- Volatilidad, Sharpe, Sortino, desvío a la baja, máximo drawdown y Calmar.
+- Medias y desvíos salen de sumas prefijas y el drawdown móvil de acumulados por
+  bloque: costo lineal, sin importar la ventana.
+- Igual que core.indicators: cada ticker usa solo sus propias barras.
+
+Convenciones (las de compare_pro.compute_volatility / compute_sharpe):
+- retornos simples, anualización con sqrt(252), desvío con ddof=1;
+- Sharpe = media del exceso / desvío de los retornos.
+"""
+
+DEFAULT_WINDOWS = (20, 60, 252)
+PERIODS_PER_YEAR = 252
+
+ROLLING_METRICS = ("volatility", "sharpe", "sortino", "downside_dev", "max_drawdown", "calmar")
+SUMMARY_METRICS = ROLLING_METRICS + ("cagr", "total_return", "last_close", "n_obs")
+
+
+def _window_sum(prefix, w):
+    """
+    Suma de las últimas w filas a partir de la suma prefija (fila 0 = primer retorno NaN).
+    Válida desde la fila w (w retornos completos).
+    """
+    out = np.full_like(prefix, np.nan)
+    if w < len(prefix):
+        out[w:] = prefix[w:] - prefix[:-w]
+    return out
+
+
+def _rolling_max_drawdown(x, w):
+    """
+    Máximo drawdown de cada ventana de w + 1 precios que termina en t. El pico se
+    reinicia al comienzo de la ventana: un máximo anterior a la ventana no cuenta.
+
+    Costo lineal O(T * N), sin importar w: el drawdown de un tramo se resume en
+    (máximo, mínimo, drawdown) y dos tramos seguidos A, B se combinan como
+    min(dd_A, dd_B, min_B / max_A - 1). Con bloques de w + 1 filas, cada ventana es
+    un bloque entero o un sufijo de un bloque + un prefijo del siguiente, y esos
+    resúmenes salen de acumulados por bloque (máximo/mínimo móvil de van Herk /
+    Gil-Werman, extendido al drawdown).
+    """
+    T, N = x.shape
+    W = w + 1
+    out = np.full_like(x, np.nan)
+    if W > T:
+        return out
+    n_blocks = -(-T // W)
+    padded = np.full((n_blocks * W, N), np.nan)
+    padded[:T] = x
+    b = padded.reshape(n_blocks, W, N)
+    rev = b[:, ::-1]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # prefijos: desde el inicio del bloque hasta la fila
+        pre_max = np.maximum.accumulate(b, axis=1)
+        pre_min = np.minimum.accumulate(b, axis=1)
+        pre_dd = np.minimum.accumulate(b / pre_max - 1.0, axis=1)
+        # sufijos: desde la fila hasta el fin del bloque
+        suf_max = np.maximum.accumulate(rev, axis=1)[:, ::-1]
+        suf_min = np.minimum.accumulate(rev, axis=1)[:, ::-1]
+        suf_dd = np.minimum.accumulate((suf_min / b - 1.0)[:, ::-1], axis=1)[:, ::-1]
+
+        pre_min, pre_dd = pre_min.reshape(-1, N)[:T], pre_dd.reshape(-1, N)[:T]
+        suf_max, suf_dd = suf_max.reshape(-1, N)[:T], suf_dd.reshape(-1, N)[:T]
+
+        t = np.arange(w, T)
+        s = t - w
+        whole = s % W == 0          # la ventana coincide con un bloque: basta el prefijo
+        out[t[whole]] = pre_dd[t[whole]]
+        t, s = t[~whole], s[~whole]
+        out[t] = np.minimum(np.minimum(suf_dd[s], pre_dd[t]), pre_min[t] / suf_max[s] - 1.0)
+    return out
+
+
+def reference_max_drawdown(close, w):
+    """
+    Referencia O(T * w) de _rolling_max_drawdown para una serie: cada ventana de
+    w + 1 precios, una por una. Para verificar (benchmarks), no para calcular.
+    """
+    close = np.asarray(close, dtype="float64")
+    out = np.full(len(close), np.nan)
+    for t in range(w, len(close)):
+        win = close[t - w:t + 1]
+        out[t] = (win / np.maximum.accumulate(win) - 1.0).min()
+    return out
+
+
+def _ratio(num, den):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(den > 0, num / np.where(den > 0, den, 1.0), np.nan)
+
+
+def compute_risk(close, windows=DEFAULT_WINDOWS, rf=0.0, mar=0.0, periods_per_year=PERIODS_PER_YEAR):
+    """
+    close: DataFrame fecha x ticker (NaN = no cotiza) o matriz (T x N).
+    rf: tasa libre de riesgo anual (Sharpe/Sortino). mar: retorno mínimo aceptable
+    por barra para el desvío a la baja.
+
+    Devuelve dict con:
+    - "dates", "tickers"
+    - "{métrica}_{w}": matriz (T x N) con la métrica móvil de w retornos
+    - "summary": DataFrame ticker x métrica del período completo
+    """
+    if isinstance(close, pd.DataFrame):
+        dates, tickers = close.index, list(close.columns)
+    else:
+        dates, tickers = None, None
+    c = as_matrix(close)
+    if c.ndim == 1:
+        c = c[:, None]
+    if tickers is None:
+        tickers = list(range(c.shape[1]))
+
+    cc, flat, counts = compact_panel(c, c == c)
+    tail = tail_mask(cc.shape, counts)
+    ann = np.sqrt(periods_per_year)
+    rf_bar = rf / periods_per_year
+
+    # ---- una sola pasada de retornos + sumas prefijas ----
+    ret = np.full_like(cc, np.nan)
+    ret[1:] = cc[1:] / cc[:-1] - 1.0
+    ret[tail] = np.nan
+    r0 = np.nan_to_num(ret)
+    down = np.minimum(r0 - mar, 0.0)
+    down[np.isnan(ret)] = 0.0
+    S = np.cumsum(r0, axis=0)
+    S2 = np.cumsum(r0 * r0, axis=0)
+    D2 = np.cumsum(down * down, axis=0)
+
+    result = {"dates": dates, "tickers": tickers}
+    for w in windows:
+        if w < 2:
+            raise ValueError(f"Ventana inválida: {w}")
+        s, s2, d2 = _window_sum(S, w), _window_sum(S2, w), _window_sum(D2, w)
+        mean = s / w
+        std = np.sqrt(np.maximum((s2 - s * s / w) / (w - 1), 0.0))
+        downside = np.sqrt(d2 / w)
+
+        # drawdown dentro de la ventana (w retornos = w + 1 precios)
+        mdd = _rolling_max_drawdown(cc, w)
+        base = np.full_like(cc, np.nan)
+        base[w:] = cc[:-w]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ann_ret = (cc / base) ** (periods_per_year / w) - 1.0
+
+        metrics = {
+            "volatility": std * ann,
+            "sharpe": _ratio(mean - rf_bar, std) * ann,
+            "sortino": _ratio(mean - rf_bar, downside) * ann,
+            "downside_dev": downside * ann,
+            "max_drawdown": mdd,
+            "calmar": _ratio(ann_ret, -mdd),
+        }
+        for name, values in metrics.items():
+            values[tail] = np.nan
+            result[f"{name}_{w}"] = expand_panel(values, flat)
+
+    result["summary"] = _summary(cc, counts, S, S2, D2, ann, rf_bar, periods_per_year, tickers)
+    return result
+
+
+def _summary(cc, counts, S, S2, D2, ann, rf_bar, periods_per_year, tickers):
+    cols = np.arange(cc.shape[1])
+    last = np.maximum(counts - 1, 0)
+    n = counts - 1                                   # cantidad de retornos
+    ok = n >= 2
+
+    s, s2, d2 = S[last, cols], S2[last, cols], D2[last, cols]
+    nn = np.where(ok, n, 2).astype("float64")
+    mean = s / nn
+    std = np.sqrt(np.maximum((s2 - s * s / nn) / (nn - 1), 0.0))
+    downside = np.sqrt(d2 / nn)
+
+    running_peak = np.fmax.accumulate(cc, axis=0)
+    dd = cc / running_peak - 1.0
+    dd[tail_mask(cc.shape, counts)] = np.nan
+    with np.errstate(invalid="ignore"):
+        mdd = np.nanmin(np.where(np.isnan(dd), np.inf, dd), axis=0)
+    mdd = np.where(np.isinf(mdd), np.nan, mdd)
+
+    first, final = cc[0], cc[last, cols]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        total = final / first - 1.0
+        cagr = (final / first) ** (periods_per_year / nn) - 1.0
+
+    summary = pd.DataFrame({
+        "volatility": std * ann,
+        "sharpe": _ratio(mean - rf_bar, std) * ann,
+        "sortino": _ratio(mean - rf_bar, downside) * ann,
+        "downside_dev": downside * ann,
+        "max_drawdown": mdd,
+        "calmar": _ratio(cagr, -mdd),
+        "cagr": cagr,
+        "total_return": total,
+        "last_close": np.where(counts > 0, final, np.nan),
+        "n_obs": counts,
+    }, index=tickers)
+    summary.loc[~ok, list(ROLLING_METRICS) + ["cagr"]] = np.nan
+    return summary
+
+
+def rolling_frame(result, ticker, window):
+    """
+    DataFrame fecha x métrica de un ticker para una ventana.
+    """
+    j = result["tickers"].index(ticker)
+    df = pd.DataFrame(
+        {m: result[f"{m}_{window}"][:, j] for m in ROLLING_METRICS},
+        index=result["dates"],
+    )
+    return df.dropna(how="all")
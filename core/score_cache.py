@@ -0,0 +1,174 @@
+# core/score_cache.py
+import hashlib
+import os
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+
+from core.config import SENTIMENT_CACHE_PATH, SENTIMENT_CACHE_MEMORY_ITEMS
+
+"""
+Cache persistente de puntajes de sentimiento por texto.
+- Clave: (modelo, versión, hash del texto normalizado). Cambiar de modelo o de
+  versión invalida solo sus puntajes; cada modelo (DistilBERT, TextBlob) tiene los suyos.
+- Dos niveles: LRU en memoria delante de una tabla SQLite en data/cache/.
+- Los puntajes no vencen: el mismo texto con el mismo modelo da el mismo resultado.
+- Si la base no se puede abrir o escribir, sigue funcionando solo en memoria.
+"""
+
+_BATCH = 500
+
+
+def normalize_text(text):
+    """
+    Unicode NFKC, espacios colapsados y sin bordes: variantes triviales del mismo
+    titular comparten puntaje.
+    """
+    return " ".join(unicodedata.normalize("NFKC", text or "").split())
+
+
+def text_hash(normalized):
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ScoreCache:
+    """
+    LRU en memoria + SQLite para puntajes (float) por (modelo, versión, hash).
+    """
+
+    def __init__(self, path, max_items=4096):
+        self.path = path
+        self.max_items = max_items
+        self._mem = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._disk_ok = True
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "disk_errors": 0}
+
+    # ---------- helpers ----------
+    def _db(self):
+        """
+        Conexión compartida (se usa siempre bajo self._lock). None si no hay disco.
+        """
+        if self._conn is None and self._disk_ok:
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS scores ("
+                    " model TEXT NOT NULL, version TEXT NOT NULL, text_hash TEXT NOT NULL,"
+                    " score REAL NOT NULL,"
+                    " PRIMARY KEY (model, version, text_hash))"
+                )
+                conn.commit()
+                self._conn = conn
+            except (OSError, sqlite3.Error):
+                self._disk_ok = False
+                self.stats["disk_errors"] += 1
+        return self._conn
+
+    def _mem_put(self, key, score):
+        self._mem[key] = score
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_items:
+            self._mem.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def _disk_get(self, model, version, hashes):
+        conn = self._db()
+        if conn is None or not hashes:
+            return {}
+        found = {}
+        try:
+            for i in range(0, len(hashes), _BATCH):
+                chunk = hashes[i:i + _BATCH]
+                rows = conn.execute(
+                    "SELECT text_hash, score FROM scores WHERE model = ? AND version = ?"
+                    f" AND text_hash IN ({','.join('?' * len(chunk))})",
+                    (model, version, *chunk),
+                )
+                found.update(rows)
+        except sqlite3.Error:
+            self.stats["disk_errors"] += 1
+        return found
+
+    def _disk_put(self, model, version, items):
+        conn = self._db()
+        if conn is None or not items:
+            return
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO scores (model, version, text_hash, score) VALUES (?, ?, ?, ?)",
+                [(model, version, h, s) for h, s in items.items()],
+            )
+            conn.commit()
+        except sqlite3.Error:
+            self.stats["disk_errors"] += 1
+
+    # ---------- API ----------
+    def get_or_score(self, model, version, texts, score_fn):
+        """
+        Puntajes para texts (mismo orden). score_fn(lista de textos normalizados)
+        se llama una sola vez con los que falten, sin repetidos.
+        """
+        normalized = [normalize_text(t) for t in texts]
+        hashes = [text_hash(t) for t in normalized]
+        scores = {}
+
+        with self._lock:
+            for h in set(hashes):
+                key = (model, version, h)
+                if key in self._mem:
+                    self._mem.move_to_end(key)
+                    scores[h] = self._mem[key]
+            pending = list(dict.fromkeys(h for h in hashes if h not in scores))
+            from_disk = self._disk_get(model, version, pending)
+            for h, s in from_disk.items():
+                self._mem_put((model, version, h), s)
+
+            # estadísticas por texto pedido (los repetidos cuentan cada vez)
+            for h in hashes:
+                if h in from_disk:
+                    self.stats["disk_hits"] += 1
+                elif h in scores:
+                    self.stats["hits"] += 1
+                else:
+                    self.stats["misses"] += 1
+            scores.update(from_disk)
+
+        missing = {}
+        for h, t in zip(hashes, normalized):
+            if h not in scores and h not in missing:
+                missing[h] = t
+        if missing:
+            new = dict(zip(missing, (float(s) for s in score_fn(list(missing.values())))))
+            with self._lock:
+                for h, s in new.items():
+                    self._mem_put((model, version, h), s)
+                self._disk_put(model, version, new)
+            scores.update(new)
+        return [scores[h] for h in hashes]
+
+    def clear_memory(self):
+        with self._lock:
+            self._mem.clear()
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["memory_items"] = len(self._mem)
+        lookups = stats["hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = round((lookups - stats["misses"]) / lookups, 3) if lookups else 0.0
+        return stats
+
+
+score_cache = ScoreCache(SENTIMENT_CACHE_PATH, SENTIMENT_CACHE_MEMORY_ITEMS)
+
+
+def cached_scores(model, version, texts, score_fn):
+    """
+    Atajo sobre el cache global: ver ScoreCache.get_or_score.
+    """
+    return score_cache.get_or_score(model, version, list(texts), score_fn)
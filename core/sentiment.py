@@ -1,6 +1,6 @@
 # core/sentiment.py
 
-from core.sentiment_model import sentiment_score
+from core.sentiment_model import sentiment_score, sentiment_scores
 
 def analyze_sentiment_textblob(text: str):
     """
@@ -22,4 +22,4 @@ def analyze_sentiment_textblob(text: str):
         "sentiment": sentiment
     }
 
-__all__ = ["analyze_sentiment_textblob", "sentiment_score"]
+__all__ = ["analyze_sentiment_textblob", "sentiment_score", "sentiment_scores"]
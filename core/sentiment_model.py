@@ -4,24 +4,74 @@ from transformers import AutoTokenizer, AutoModelForSequenceClassification
 import torch
 import functools
 
+from core.config import SENTIMENT_BATCH_SIZE, SENTIMENT_THREADS
+from core.score_cache import cached_scores
+
+"""
+Sentimiento con DistilBERT (SST-2), en lotes.
+- Los textos se tokenizan una sola vez sin padding, se ordenan por largo y se
+  agrupan de a batch_size: cada lote se rellena solo hasta su texto más largo
+  (padding dinámico), así los titulares cortos no pagan por uno largo.
+- Una sola pasada del modelo por lote en lugar de una por texto.
+- La cantidad de hilos de torch se ajusta con SENTIMENT_THREADS (o num_threads).
+- Los puntajes pasan por core.score_cache: solo se infieren los textos nuevos.
+"""
+
+MODEL_ID = "distilbert-base-uncased-finetuned-sst-2-english"
+# subir si cambia el modelo, la escala o el preprocesado (invalida el cache de puntajes)
+MODEL_VERSION = "1"
+
 @functools.lru_cache(maxsize=1)
 def load_sentiment_model():
-    tokenizer = AutoTokenizer.from_pretrained("distilbert-base-uncased-finetuned-sst-2-english")
-    model = AutoModelForSequenceClassification.from_pretrained("distilbert-base-uncased-finetuned-sst-2-english")
+    tokenizer = AutoTokenizer.from_pretrained(MODEL_ID)
+    model = AutoModelForSequenceClassification.from_pretrained(MODEL_ID)
+    model.eval()
+    if SENTIMENT_THREADS:
+        torch.set_num_threads(SENTIMENT_THREADS)
     return tokenizer, model
 
 
-def sentiment_score(text):
+def sentiment_scores(texts, batch_size=SENTIMENT_BATCH_SIZE, num_threads=None):
+    """
+    Puntajes de -1 (negativo) a +1 (positivo) para una lista de textos,
+    en el mismo orden recibido.
+    """
+    texts = [t or "" for t in texts]
+    if not texts:
+        return []
+    return cached_scores(
+        MODEL_ID, MODEL_VERSION, texts,
+        lambda missing: _infer_scores(missing, batch_size, num_threads),
+    )
+
+
+def _infer_scores(texts, batch_size, num_threads):
     tokenizer, model = load_sentiment_model()
+    if num_threads:
+        torch.set_num_threads(num_threads)
 
-    inputs = tokenizer(text, return_tensors="pt", truncation=True)
-    with torch.no_grad():
-        outputs = model(**inputs)
+    encoded = tokenizer(texts, truncation=True, padding=False)
+    ids, masks = encoded["input_ids"], encoded["attention_mask"]
+    # lotes de largos parecidos: menos tokens de relleno
+    order = sorted(range(len(texts)), key=lambda i: len(ids[i]))
 
-    scores = torch.softmax(outputs.logits, dim=1).tolist()[0]
-    negative, positive = scores
+    scores = [0.0] * len(texts)
+    batch_size = max(1, int(batch_size))
+    for start in range(0, len(order), batch_size):
+        idx = order[start:start + batch_size]
+        batch = tokenizer.pad(
+            {"input_ids": [ids[i] for i in idx], "attention_mask": [masks[i] for i in idx]},
+            padding="longest",
+            return_tensors="pt",
+        )
+        with torch.no_grad():
+            logits = model(**batch).logits
+        probs = torch.softmax(logits, dim=1)
+        # Escala normalizada: -1 (negativo) a +1 (positivo)
+        for i, score in zip(idx, (probs[:, 1] - probs[:, 0]).tolist()):
+            scores[i] = float(score)
+    return scores
 
-    # Escala normalizada: -1 (negativo) a +1 (positivo)
-    score = positive - negative
 
-    return float(score)
+def sentiment_score(text):
+    return sentiment_scores([text])[0]
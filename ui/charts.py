@@ -1,23 +1,68 @@
 # ui/charts.py
-
 import streamlit as st
 import plotly.graph_objects as go
 
-def comparison_chart(df, ticker1, ticker2):
-    """Grafico de comparación porcentual entre dos activos."""
+from core.config import CHART_WEBGL_THRESHOLD
+from core.alignment import is_crypto
+from core.ohlc_pyramid import chart_frame, range_level, CHART_MIN_POINTS
+from core.decimation import DEFAULT_CHART_WIDTH, decimate_candles, decimate_line, point_budget
+from core.figure_cache import figure_cache, figure_key
+from core.indicator_cache import series_fingerprint
+
+def scatter_trace(total_points, **kwargs):
+    """
+    Scatter común o Scattergl (WebGL) si el gráfico dibuja (ya decimado) más de
+    CHART_WEBGL_THRESHOLD puntos.
+    """
+    cls = go.Scattergl if total_points > CHART_WEBGL_THRESHOLD else go.Scatter
+    return cls(**kwargs)
+
+def plot_cached(key, build_fn):
+    """Dibuja la figura cacheada para key (build_fn() arma el go.Figure si no está)."""
+    st.plotly_chart(figure_cache.get_or_build(key, build_fn), use_container_width=True)
+
+def _data_revision(df, cols):
+    # sin revisión del llamador: huella del contenido (recorre la serie, O(n))
+    if df is None or len(df) == 0:
+        return None
+    return series_fingerprint(df[cols].to_numpy(dtype="float64").ravel(), df["date"].to_numpy())
 
+def comparison_chart(df, ticker1, ticker2, width=DEFAULT_CHART_WIDTH, revision=None):
+    """
+    Grafico de comparación porcentual entre dos activos.
+    revision: versión de los datos (p. ej. ohlc_store.store_revision de ambos);
+    si se pasa, un hit del cache no recorre df.
+    """
+
+    cols = [f"pct_{ticker1}", f"pct_{ticker2}"]
+    start = df["date"].iloc[0] if len(df) else None
+    end = df["date"].iloc[-1] if len(df) else None
+    if revision is None:
+        revision = _data_revision(df, cols)
+    key = figure_key("comparison", (ticker1, ticker2), start, end, None, cols, revision, width)
+    plot_cached(key, lambda: _comparison_figure(df, ticker1, ticker2, width))
+
+def _comparison_figure(df, ticker1, ticker2, width):
     fig = go.Figure()
+    # LTTB por línea: ~1 punto por pixel, con picos y valles preservados
+    budget = point_budget(width, "line")
+
+    x1, y1 = decimate_line(df["date"], df[f"pct_{ticker1}"], budget)
+    x2, y2 = decimate_line(df["date"], df[f"pct_{ticker2}"], budget)
+    total = len(y1) + len(y2)
 
-    fig.add_trace(go.Scatter(
-        x=df["date"], 
-        y=df[f"pct_{ticker1}"],
+    fig.add_trace(scatter_trace(
+        total,
+        x=x1,
+        y=y1,
         mode="lines",
         name=ticker1
     ))
 
-    fig.add_trace(go.Scatter(
-        x=df["date"], 
-        y=df[f"pct_{ticker2}"],
+    fig.add_trace(scatter_trace(
+        total,
+        x=x2,
+        y=y2,
         mode="lines",
         name=ticker2
     ))
@@ -28,10 +73,22 @@ def comparison_chart(df, ticker1, ticker2):
         yaxis_title="Variación % desde inicio",
         height=450
     )
+    return fig
 
-    st.plotly_chart(fig, use_container_width=True)
+def render_candlestick(df, ticker, start=None, end=None, min_points=CHART_MIN_POINTS,
+                       width=DEFAULT_CHART_WIDTH, revision=None):
+    # con rango explícito la resolución sale del calendario, antes de agregar barras
+    resolution = range_level(start, end, min_points, is_crypto(ticker)) if start and end else None
+    if revision is None:
+        revision = _data_revision(df, ["open", "high", "low", "close"])
+    key = figure_key("candlestick", ticker, start, end, resolution or min_points, (), revision, width)
+    plot_cached(key, lambda: _candlestick_figure(df, ticker, start, end, min_points, resolution, width))
 
-def render_candlestick(df, ticker):
+def _candlestick_figure(df, ticker, start, end, min_points, resolution, width):
+    # nivel más grueso (1D/1W/1M, o 1h/4h si es intradiario) que alcance min_points en el rango
+    df, resolution = chart_frame(df, start, end, min_points, level=resolution)
+    # si aun así no entran en el ancho, baldes min/max (las mechas conservan los extremos)
+    df = decimate_candles(df, point_budget(width, "candle"))
     fig=go.Figure(data=[go.Candlestick(
         x=df["date"],
         open=df["open"],
@@ -39,5 +96,5 @@ def render_candlestick(df, ticker):
         low=df["low"],
         close=df["close"]
     )])
-    fig.update_layout(title=f"Velas - {ticker}", height=600)
-    st.plotly_chart(fig, use_container_width=True)
+    fig.update_layout(title=f"Velas - {ticker} ({resolution})", height=600)
+    return fig
@@ -7,8 +7,8 @@ import plotly.graph_objects as go
 # --- Importaciones del core ---
 from core.compare_pro import compare_pro
 from core.etf_finder import suggest_etfs_by_keyword, get_etf_metadata
-from core.fundamentals import fetch_fundamentals
-from core.data_fetch import fetch_ohlc
+from core.fundamentals import fetch_fundamentals, fetch_fundamentals_many
+from core.data_fetch import fetch_ohlc_many
 
 
 # ======================================================
@@ -96,6 +96,9 @@ def render_compare_pro_ui():
         fig.update_layout(template="plotly_dark", height=350)
         st.plotly_chart(fig, use_container_width=True)
 
+        if result.get("correlation") is not None:
+            st.metric("Correlación de retornos diarios", result["correlation"])
+
         # -----------------------
         # Indicadores
         # -----------------------
@@ -151,17 +154,23 @@ def render_competitors_ui():
 
     st.markdown("### Mini-perfiles:")
 
-    for c in competitors[:8]:
-        f, _ = fetch_fundamentals(c)
+    peers = competitors[:8]
+
+    # Descarga concurrente de fundamentals y precios recientes
+    fund_map, _ = fetch_fundamentals_many(peers)
+    ohlc_map, _ = fetch_ohlc_many(
+        peers,
+        from_date=datetime.now().date() - timedelta(days=30),
+        to_date=datetime.now().date()
+    )
+
+    for c in peers:
+        f, _ = fund_map.get(c, ({}, []))
 
         # Intentamos obtener precio reciente
         try:
-            df = fetch_ohlc(
-                c,
-                from_date=datetime.now().date() - timedelta(days=30),
-                to_date=datetime.now().date()
-            )
-            price = df["close"].iloc[-1] if not df.empty else None
+            df = ohlc_map.get(c)
+            price = df["close"].iloc[-1] if df is not None and not df.empty else None
         except:
             price = None
 
@@ -11,29 +11,21 @@ from core.favorites import (
     remove_favorite as persist_remove_favorite,
     clear_favorites as persist_clear_favorites
 )
+from core.demo_data import (
+    STOCK_TICKERS,
+    CRYPTO_TICKERS,
+    ETF_TICKERS,
+    demo_ohlc
+)
+from core.ohlc_pyramid import chart_frame, range_level
+from core.alignment import is_crypto
+from core.decimation import decimate_candles, point_budget
+from core.figure_cache import figure_key
+from ui.charts import plot_cached, scatter_trace
 
 # ======================================================
 # DEMO DATA
 # ======================================================
-STOCK_TICKERS = {
-    "Microsoft": "MSFT.US",
-    "Apple": "AAPL.US",
-    "Google": "GOOGL.US",
-    "Amazon": "AMZN.US",
-    "Galicia": "GGAL.BA"
-}
-
-CRYPTO_TICKERS = {
-    "Bitcoin": "BTC.CRYPTO",
-    "Ethereum": "ETH.CRYPTO",
-    "Solana": "SOL.CRYPTO"
-}
-
-ETF_TICKERS = {
-    "Tech ETF": "ETF.TECH",
-    "Global ETF": "ETF.GLOBAL",
-    "AI ETF": "ETF.AI"
-}
 ETF_THEMES = [
     "Technology", "Energy", "Healthcare",
     "Artificial Intelligence", "Fintech", "Space"
@@ -66,22 +58,6 @@ def market_status(t):
     return "🟢 Wall Street abierto" if time(9, 30) <= now <= time(16, 0) else "🔴 Wall Street cerrado"
 
 
-def demo_ohlc(start, end):
-    days = max((end - start).days, 30)
-    dates = pd.date_range(start=start, periods=days)
-    price = 100 + np.cumsum(np.random.randn(days))
-    df = pd.DataFrame({
-        "date": dates,
-        "open": price + np.random.randn(days),
-        "close": price,
-    })
-    df["high"] = df[["open", "close"]].max(axis=1) + abs(np.random.randn(days))
-    df["low"] = df[["open", "close"]].min(axis=1) - abs(np.random.randn(days))
-    df["SMA20"] = df["close"].rolling(20).mean()
-    df["EMA20"] = df["close"].ewm(span=20).mean()
-    return df
-
-
 def risk_score(t):
     score = 20 if t.endswith(".CRYPTO") else 10
     alerts = SMART_ALERTS.get(t, {})
@@ -423,21 +399,38 @@ def show_dashboard():
             st.error("Rango de fechas inválido")
 
     # ---------- GRÁFICO ----------
-    df = demo_ohlc(st.session_state.start_date, st.session_state.end_date)
-
-    fig = go.Figure()
-    fig.add_candlestick(
-        x=df["date"],
-        open=df["open"],
-        high=df["high"],
-        low=df["low"],
-        close=df["close"],
-        name="Precio"
+    start, end = st.session_state.start_date, st.session_state.end_date
+    # rangos largos: velas semanales/mensuales en lugar de miles de diarias
+    # (la resolución sale del calendario, sin cargar datos)
+    resolution = range_level(start, end, crypto=is_crypto(ticker))
+    if resolution != "1D":
+        st.caption(f"Resolución: {resolution}")
+
+    def build_price_figure():
+        df = demo_ohlc(ticker, start, end)
+        df, _ = chart_frame(df, start, end, level=resolution)
+        chart_df = decimate_candles(df, point_budget(kind="candle"))
+        # WebGL según los puntos que se dibujan de verdad (las velas no tienen versión WebGL)
+        total = 3 * len(chart_df)
+        fig = go.Figure()
+        fig.add_candlestick(
+            x=chart_df["date"],
+            open=chart_df["open"],
+            high=chart_df["high"],
+            low=chart_df["low"],
+            close=chart_df["close"],
+            name="Precio"
+        )
+        fig.add_trace(scatter_trace(total, x=chart_df["date"], y=chart_df["SMA20"], name="SMA 20"))
+        fig.add_trace(scatter_trace(total, x=chart_df["date"], y=chart_df["EMA20"], name="EMA 20"))
+        return fig
+
+    # mismo ticker, rango, resolución e indicadores -> se reutiliza el go.Figure ya armado
+    # (los datos demo solo cambian con el día)
+    key = figure_key(
+        "dashboard", ticker, start, end, resolution, ("SMA20", "EMA20"), ("demo", date.today())
     )
-    fig.add_scatter(x=df["date"], y=df["SMA20"], name="SMA 20")
-    fig.add_scatter(x=df["date"], y=df["EMA20"], name="EMA 20")
-
-    st.plotly_chart(fig, use_container_width=True)
+    plot_cached(key, build_price_figure)
 
     # ================= ALERTAS =================
     if ticker in PRICE_ALERTS: